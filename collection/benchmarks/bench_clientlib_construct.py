@@ -0,0 +1,43 @@
+"""
+Micro-benchmark of API client construction.
+
+Run from the `collection` directory:
+
+    python benchmarks/bench_clientlib_construct.py [--number N]
+"""
+import argparse
+import pathlib
+import sys
+import timeit
+
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1]))
+
+import clientlib
+
+
+class Client(clientlib.BaseAPIClient):
+    max_timeout = 5
+    root_uri    = "http://localhost"
+    headers     = {"X-Example": "1"}
+
+
+def bench(name, func, number):
+    elapsed = timeit.timeit(func, number=number)
+    print(f"{name:<28} {elapsed / number * 1e6:8.1f} us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    # the first construction validates the class.
+    Client().__session__.close()
+
+    bench("_pre (per instance)", lambda: Client._pre((), {}), args.number)
+    bench("construct + close session", lambda: Client().__session__.close(), args.number)
+    bench("subclass creation", lambda: type("Sub", (Client,), {"root_uri": "x"}), args.number)
+
+
+if __name__ == "__main__":
+    main()
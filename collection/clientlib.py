@@ -3,12 +3,44 @@ Use for simplifying API callouts.
 """
 
 import abc
+import base64
+import bisect
+import collections
+import contextlib
+import dataclasses
+import datetime
+import email.utils
 import enum
+import hashlib
+import json
+import logging
 import os
-
-from typing import Any, Callable, Protocol
-
+import pathlib
+import queue
+import re
+import socket
+import ssl
+import threading
+import time
+import urllib.parse
+
+try:
+    import fcntl
+except ImportError: # windows
+    fcntl = None
+    import msvcrt
+
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Iterable, Iterator, Protocol
+
+import aiohttp
 import requests
+import requests.adapters
+
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 
 
 class ClientLibException(BaseException):
@@ -35,10 +67,704 @@ class ClientResponseError(ClientLibException):
         return f"<[{self.status}]: {self.message} [elapsed: {self.elapsed}s]"
 
 
-def _get_public_attrs(obj: object):
-    return [(i, getattr(obj, i))
-        for i in dir(obj) if "_" not in i[:2]
-    ]
+class CircuitOpenError(ClientResponseError):
+    """Raise if an endpoint's circuit is open."""
+
+    def __init__(self, message, retry_after=0.0):
+        super().__init__(message, status=503)
+        self.retry_after = retry_after
+
+
+@dataclasses.dataclass
+class PoolStats:
+    """Usage of the connection pool for one host."""
+    scheme:      str
+    host:        str
+    port:        int
+    connections: int # connections opened
+    requests:    int # requests sent
+    idle:        int # connections ready for reuse
+
+
+@dataclasses.dataclass
+class BatchResult:
+    """Outcome of one request sent by `send_many`."""
+    index:    int
+    method:   str
+    endpoint: str
+    response: requests.Response | None = None
+    error:    BaseException | None     = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+@enum.unique
+class CircuitState(str, enum.Enum):
+    """State of a `CircuitBreaker`."""
+    CLOSED    = "closed"
+    OPEN      = "open"
+    HALF_OPEN = "half-open"
+
+    def __str__(self):
+        return self.value
+
+
+class CircuitBreaker:
+    """
+    Stops calls to an endpoint once the failure
+    rate over the last `window` calls reaches
+    `failure_rate`. After `cooldown` seconds up to
+    `probes` trial calls are let through; the
+    circuit closes if they succeed and reopens if
+    any fails.
+    """
+
+    def __init__(
+        self, failure_rate: float = 0.5, window: int = 20,
+        min_calls: int = 10, cooldown: float = 30.0, probes: int = 1):
+        self.failure_rate = failure_rate
+        self.min_calls    = min_calls
+        self.cooldown     = cooldown
+        self.probes       = probes
+
+        self._state    = CircuitState.CLOSED
+        self._outcomes = collections.deque(maxlen=window)
+        self._opened   = 0.0
+        self._trials   = 0
+        self._lock     = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state(time.monotonic())
+
+    def acquire(self):
+        """Raise `CircuitOpenError` if calls are refused."""
+        with self._lock:
+            now   = time.monotonic()
+            state = self._current_state(now)
+            if state is CircuitState.CLOSED:
+                return
+            if state is CircuitState.HALF_OPEN and self._trials < self.probes:
+                self._trials += 1
+                return
+            retry_after = max(0.0, self._opened + self.cooldown - now)
+        raise CircuitOpenError(f"circuit is {state}", retry_after)
+
+    def record(self, success: bool):
+        """Record the outcome of an allowed call."""
+        with self._lock:
+            state = self._current_state(time.monotonic())
+            if state is CircuitState.HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+                if success:
+                    self._state = CircuitState.CLOSED
+                    self._outcomes.clear()
+                else:
+                    self._open()
+                return
+
+            self._outcomes.append(success)
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = self._outcomes.count(False) / len(self._outcomes)
+            if failures >= self.failure_rate:
+                self._open()
+
+    def release(self):
+        """Give back an allowed call that ended without an outcome."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._trials = max(0, self._trials - 1)
+
+    def _current_state(self, now):
+        if self._state is CircuitState.OPEN and now - self._opened >= self.cooldown:
+            self._state  = CircuitState.HALF_OPEN
+            self._trials = 0
+        return self._state
+
+    def _open(self):
+        self._state  = CircuitState.OPEN
+        self._opened = time.monotonic()
+        self._outcomes.clear()
+
+
+@dataclasses.dataclass
+class RequestRecord:
+    """Measurements of one request."""
+    method:         str
+    endpoint:       str
+    status:         int | None
+    elapsed:        float            # until the response was returned
+    ttfb:           float | None     # until the response headers were parsed
+    bytes_sent:     int
+    bytes_received: int
+    retries:        int              = 0
+    from_cache:     bool             = False
+    error:          str | None       = None
+
+
+@dataclasses.dataclass
+class EndpointStats:
+    """Aggregated `RequestRecord`s of an endpoint."""
+    requests:       int              = 0
+    errors:         int              = 0
+    retries:        int              = 0
+    cache_hits:     int              = 0
+    bytes_sent:     int              = 0
+    bytes_received: int              = 0
+    elapsed_total:  float            = 0.0
+    elapsed_max:    float            = 0.0
+    ttfb_total:     float            = 0.0
+    statuses:       dict[int, int]   = dataclasses.field(default_factory=dict)
+    buckets:        list[int]        = dataclasses.field(
+        default_factory=lambda: [0] * len(LATENCY_BUCKETS))
+
+    @property
+    def elapsed_mean(self):
+        return self.elapsed_total / self.requests if self.requests else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the `q` quantile."""
+        rank, seen = q * self.requests, 0
+        for bound, count in zip(LATENCY_BUCKETS, self.buckets):
+            seen += count
+            if seen >= rank and seen:
+                return bound
+        return 0.0
+
+    def add(self, record: RequestRecord):
+        self.requests       += 1
+        self.errors         += int(record.error is not None)
+        self.retries        += record.retries
+        self.cache_hits     += int(record.from_cache)
+        self.bytes_sent     += record.bytes_sent
+        self.bytes_received += record.bytes_received
+        self.elapsed_total  += record.elapsed
+        self.elapsed_max     = max(self.elapsed_max, record.elapsed)
+        self.ttfb_total     += record.ttfb or 0.0
+        if record.status is not None:
+            self.statuses[record.status] = self.statuses.get(record.status, 0) + 1
+        self.buckets[bisect.bisect_left(LATENCY_BUCKETS, record.elapsed)] += 1
+
+
+class MetricsExporter(Protocol):
+    """Receives every `RequestRecord` of a client."""
+
+    def export(self, record: RequestRecord) -> None:
+        """Handle a finished request."""
+
+
+class LoggingExporter:
+    """Log each request at `level`."""
+
+    def __init__(self, logger: logging.Logger = None, level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger(__name__)
+        self.level  = level
+
+    def export(self, record):
+        self.logger.log(
+            self.level, "%s /%s [%s] %.3fs (%d retries, %d bytes)",
+            record.method.upper(), record.endpoint, record.error or record.status,
+            record.elapsed, record.retries, record.bytes_received)
+
+
+class RequestMetrics:
+    """Thread safe per-endpoint request stats."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock  = threading.Lock()
+
+    def record(self, record: RequestRecord):
+        with self._lock:
+            if record.endpoint not in self._stats:
+                self._stats[record.endpoint] = EndpointStats()
+            self._stats[record.endpoint].add(record)
+
+    def snapshot(self) -> dict[str, EndpointStats]:
+        with self._lock:
+            return {
+                e: dataclasses.replace(
+                    s, statuses=dict(s.statuses), buckets=list(s.buckets))
+                for e, s in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+class Paginator(abc.ABC):
+    """
+    Walks the pages of a paginated endpoint.
+    Items are found at the dotted `items_key` of
+    each JSON page, or the page itself if `None`.
+    """
+
+    def __init__(self, items_key: str | None = "data"):
+        self.items_key = items_key
+
+    def items(self, resp: requests.Response) -> list:
+        return _dotted_get(resp.json(), self.items_key) or []
+
+    def first(self, endpoint: str, kwargs: dict) -> tuple[str, dict]:
+        """Request for the first page."""
+        return endpoint, kwargs
+
+    @abc.abstractmethod
+    def next(self, resp: requests.Response, items: list, endpoint: str, kwargs: dict):
+        """Request for the page after `resp`, `None` if last."""
+        return NotImplemented
+
+
+class CursorPagination(Paginator):
+    """Pages linked by a cursor returned in each page."""
+
+    def __init__(
+        self, items_key: str | None = "data",
+        cursor_key: str = "next_cursor", cursor_param: str = "cursor"):
+        super().__init__(items_key)
+        self.cursor_key   = cursor_key
+        self.cursor_param = cursor_param
+
+    def next(self, resp, items, endpoint, kwargs):
+        cursor = _dotted_get(resp.json(), self.cursor_key)
+        if not cursor:
+            return None
+        return endpoint, _with_params(kwargs, {self.cursor_param: cursor})
+
+
+class OffsetPagination(Paginator):
+    """
+    Pages of `limit` items, ending with the first
+    short page.
+    """
+
+    def __init__(
+        self, items_key: str | None = "data", limit: int = 100,
+        offset_param: str = "offset", limit_param: str = "limit"):
+        super().__init__(items_key)
+        self.limit        = limit
+        self.offset_param = offset_param
+        self.limit_param  = limit_param
+
+    def first(self, endpoint, kwargs):
+        params = {self.offset_param: 0, self.limit_param: self.limit}
+        return endpoint, _with_params(kwargs, params)
+
+    def next(self, resp, items, endpoint, kwargs):
+        if len(items) < self.limit:
+            return None
+        offset = kwargs["params"][self.offset_param] + len(items)
+        return endpoint, _with_params(kwargs, {self.offset_param: offset})
+
+
+class LinkPagination(Paginator):
+    """Pages linked by a `Link: <...>; rel="next"` header."""
+
+    def __init__(self, items_key: str | None = None):
+        super().__init__(items_key)
+
+    def next(self, resp, items, endpoint, kwargs):
+        link = resp.links.get("next", {}).get("url")
+        if not link:
+            return None
+
+        # the endpoint is kept as given where the link
+        # path allows, so per endpoint state is not
+        # keyed by each page. The link's query
+        # replaces the parameters sent before.
+        url    = urllib.parse.urlsplit(urllib.parse.urljoin(resp.url, link))
+        path   = url.path.rstrip("/")
+        suffix = "/" + (endpoint or "").strip("/")
+        if endpoint and path.endswith(suffix):
+            root = path[:-len(suffix)]
+        else:
+            root, endpoint = "", path.lstrip("/")
+
+        kwargs = dict(kwargs)
+        kwargs["root_uri"] = f"{url.scheme}://{url.netloc}{root}"
+        kwargs["params"]   = urllib.parse.parse_qsl(url.query, keep_blank_values=True)
+        return endpoint, kwargs
+
+
+class TokenBucket:
+    """
+    Thread safe token bucket refilled at `rate`
+    tokens a second, up to `burst`. Given a `path`,
+    its state is kept in that file under a lock so
+    every process using the file shares it.
+
+    `observe` adapts the bucket to the rate limit
+    headers of a response: `Retry-After` pauses
+    it, and `X-RateLimit-Remaining/Reset` slow it
+    to what is left of the upstream window, after
+    which it returns to `rate`.
+    """
+
+    def __init__(self, rate: float, burst: float = None, path: str | os.PathLike = None):
+        self.rate  = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+        self.path  = None if path is None else pathlib.Path(path)
+
+        self._state = {
+            "tokens": self.burst, "stamp": time.time(),
+            "rate": self.rate, "paused": 0.0, "until": 0.0}
+        self._lock  = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, returning the
+        seconds to wait before they are available.
+        """
+
+        def take(state, now):
+            state["tokens"] -= tokens
+            delay = max(0.0, -state["tokens"] / state["rate"])
+            return max(delay, state["paused"] - now)
+
+        return self._update(take)
+
+    def acquire(self, tokens: float = 1):
+        """Block until tokens are available."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for `seconds`."""
+
+        def pause(state, now):
+            state["paused"] = max(state["paused"], now + seconds)
+
+        self._update(pause)
+
+    def observe(self, resp: requests.Response):
+        """Adapt to the rate limit headers of `resp`."""
+        retry_after = _retry_after(resp.headers.get("Retry-After"))
+        if retry_after is not None and resp.status_code in (429, 503):
+            self.pause(retry_after)
+
+        remaining = resp.headers.get("X-RateLimit-Remaining", "")
+        reset     = _ratelimit_reset(resp.headers.get("X-RateLimit-Reset"))
+        if not remaining.isdigit() or reset is None:
+            return
+        if int(remaining) == 0:
+            self.pause(reset)
+            return
+
+        def adapt(state, now):
+            state["rate"]  = min(self.rate, int(remaining) / max(reset, 1.0))
+            state["until"] = now + reset
+
+        self._update(adapt)
+
+    def _update(self, func):
+        with self._lock, _locked_file(self.path) as stream:
+            state = self._state if stream is None else _load_bucket(stream, self._state)
+            now   = time.time()
+
+            # an adapted rate only lasts until the
+            # upstream window resets.
+            if state["until"] and now >= state["until"]:
+                elapsed = max(0.0, state["until"] - state["stamp"])
+                state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+                state["stamp"]  = max(state["stamp"], state["until"])
+                state["rate"], state["until"] = self.rate, 0.0
+
+            elapsed = max(0.0, now - state["stamp"])
+            state["tokens"] = min(self.burst, state["tokens"] + elapsed * state["rate"])
+            state["stamp"]  = now
+            result = func(state, now)
+
+            if stream is not None:
+                _save_bucket(stream, state)
+            return result
+
+
+class PoolAdapter(requests.adapters.HTTPAdapter):
+    """
+    `HTTPAdapter` which can set socket options on
+    the connections it pools.
+    """
+
+    def __init__(self, *args, socket_options=None, **kwargs):
+        self.socket_options = socket_options
+        super().__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.socket_options is not None:
+            kwargs.setdefault("socket_options", self.socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+    def pool_stats(self) -> list[PoolStats]:
+        """Usage of each host pool held by this adapter."""
+        pools = self.poolmanager.pools
+        stats = []
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats.append(PoolStats(
+                key.key_scheme, key.key_host, key.key_port,
+                pool.num_connections, pool.num_requests,
+                pool.pool.qsize() if pool.pool else 0))
+        return stats
+
+
+def _keepalive_options():
+    options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+    for name in ("TCP_KEEPIDLE", "TCP_KEEPINTVL", "TCP_KEEPCNT"):
+        if not hasattr(socket, name):
+            return options
+    return options + [
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 60),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 15),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPCNT, 4)]
+
+
+CACHEABLE_STATUSES = (200, 203, 301, 404, 410)
+CLASS_STATE_LOCK   = threading.Lock()
+LATENCY_BUCKETS    = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+JSON_SCALAR        = re.compile(rb"[0-9+\-.eEtrufalsn]*")
+JSON_WHITESPACE    = re.compile(rb"[ \t\r\n]*")
+JSON_STRUCTURE     = re.compile(rb'["\[\]{}]')
+JSON_STRING_END    = re.compile(rb'["\\]')
+STREAM_CHUNK_SIZE  = 64 * 1024
+STREAM_BUFFER_SIZE = 16 * 1024 ** 2
+CACHE_DIRECTIVE    = re.compile(r"([\w-]+)(?:=\"?([^\",]*)\"?)?")
+
+
+@dataclasses.dataclass
+class CacheEntry:
+    """Stored response and its freshness."""
+    response: requests.Response
+    expires:  float
+    vary:     dict[str, str] = dataclasses.field(default_factory=dict)
+
+    @property
+    def etag(self):
+        return self.response.headers.get("ETag")
+
+    @property
+    def last_modified(self):
+        return self.response.headers.get("Last-Modified")
+
+    def is_fresh(self, now: float = None):
+        return (now or time.time()) < self.expires
+
+
+class CacheStorage(Protocol):
+    """Where `BaseAPIClient` keeps cached responses."""
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Get the entry stored at `key`."""
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry at `key`."""
+
+    def delete(self, key: str) -> None:
+        """Drop the entry stored at `key`."""
+
+    def clear(self) -> None:
+        """Drop every entry."""
+
+
+class MemoryCacheStorage:
+    """
+    Thread safe LRU of up to `max_entries`, whose
+    bodies total at most `max_bytes`.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 ** 2):
+        self.max_entries = max_entries
+        self.max_bytes   = max_bytes
+
+        self._entries = OrderedDict()
+        self._size    = 0
+        self._lock    = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, entry):
+        with self._lock:
+            self._pop(key)
+            if _entry_size(entry) > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self._size += _entry_size(entry)
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= _entry_size(entry)
+
+
+class DiskCacheStorage:
+    """
+    Entries stored as JSON in `directory`,
+    evicting the least recently used once their
+    total size passes `max_bytes`.
+    """
+
+    def __init__(self, directory: str | os.PathLike, max_bytes: int = 256 * 1024 ** 2):
+        self.directory = pathlib.Path(directory)
+        self.max_bytes = max_bytes
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as stream:
+                entry = _load_cache_entry(stream.read())
+            os.utime(path)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return entry
+
+    def set(self, key, entry):
+        path = self._path(key)
+        temp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(temp, "wb") as stream:
+            stream.write(_dump_cache_entry(entry))
+        os.replace(temp, path)
+        self._evict()
+
+    def delete(self, key):
+        self._path(key).unlink(missing_ok=True)
+
+    def clear(self):
+        for path in self.directory.glob("*.cache"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self):
+        with self._lock:
+            files = []
+            for path in self.directory.glob("*.cache"):
+                try:
+                    files.append((path.stat(), path))
+                except OSError:
+                    continue
+
+            total = sum([stat.st_size for stat, _ in files])
+            for stat, path in sorted(files, key=lambda f: f[0].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+
+    def _path(self, key):
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.cache"
+
+
+def _entry_size(entry: CacheEntry):
+    return len(entry.response.content or b"")
+
+
+def _dump_cache_entry(entry: CacheEntry) -> bytes:
+    # plain data only, so reading a shared cache
+    # directory can never run code.
+    response = entry.response
+    return json.dumps({
+        "expires":  entry.expires,
+        "vary":     entry.vary,
+        "status":   response.status_code,
+        "headers":  dict(response.headers),
+        "url":      response.url,
+        "encoding": response.encoding,
+        "reason":   response.reason,
+        "elapsed":  response.elapsed.total_seconds(),
+        "content":  base64.b64encode(response.content or b"").decode(),
+    }).encode()
+
+
+def _load_cache_entry(data: bytes) -> CacheEntry:
+    fields   = json.loads(data)
+    response = requests.Response()
+    response._content    = base64.b64decode(fields["content"], validate=True)
+    response.status_code = int(fields["status"])
+    response.headers     = requests.structures.CaseInsensitiveDict(fields["headers"])
+    response.url         = fields["url"]
+    response.encoding    = fields["encoding"]
+    response.reason      = fields["reason"]
+    response.elapsed     = datetime.timedelta(seconds=fields["elapsed"])
+    return CacheEntry(response, float(fields["expires"]), dict(fields["vary"]))
+
+
+def _cache_directives(headers: dict[str, str]):
+    value = headers.get("Cache-Control", "")
+    return {k.lower(): v for k, v in CACHE_DIRECTIVE.findall(value)}
+
+
+def _cache_lifetime(response: requests.Response, ttl: float | None):
+    # seconds the response may be served without
+    # revalidation, `None` if it must not be stored.
+    directives = _cache_directives(response.headers)
+    if "no-store" in directives or response.headers.get("Vary") == "*":
+        return None
+    if ttl is not None:
+        return ttl
+    if "no-cache" in directives:
+        return 0.0
+
+    age = float(response.headers.get("Age", 0) or 0)
+    if directives.get("max-age", "").isdigit():
+        return max(0.0, int(directives["max-age"]) - age)
+
+    expires = _http_date(response.headers.get("Expires"))
+    if expires is not None:
+        date = _http_date(response.headers.get("Date")) or time.time()
+        return max(0.0, expires - date - age)
+    return 0.0
+
+
+def _clone_response(response: requests.Response, from_cache: bool = False):
+    # a detached copy holding only what can be
+    # stored and handed out more than once.
+    clone = requests.Response()
+    clone._content    = response.content
+    clone.status_code = response.status_code
+    clone.headers     = requests.structures.CaseInsensitiveDict(response.headers)
+    clone.url         = response.url
+    clone.encoding    = response.encoding
+    clone.reason      = response.reason
+    clone.elapsed     = response.elapsed
+    clone.from_cache  = from_cache
+    return clone
+
+
+def _http_date(value: str | None):
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _vary_headers(response: requests.Response, headers: dict[str, str]):
+    names = [n.strip() for n in response.headers.get("Vary", "").split(",") if n.strip()]
+    return {n.lower(): headers.get(n) for n in names}
 
 
 class NotDefinedType(type):
@@ -160,13 +886,19 @@ def _ensure_annotated(obj: object, name: str):
 
 
 def _get_annotation(obj: object, name: str):
+    return _get_annotations(obj)[name]
+
+
+def _get_annotations(obj: object):
     if not isinstance(obj, type):
         obj = obj.__class__
-    _annotations_ = obj.__annotations__.copy()
+    if "__field_annotations__" in obj.__dict__:
+        return obj.__field_annotations__
 
-    for base in obj.__bases__:
-        _annotations_.update(base.__annotations__)
-    return _annotations_[name]
+    _annotations_ = {}
+    for base in reversed(obj.__mro__):
+        _annotations_.update(base.__dict__.get("__annotations__", {}))
+    return _annotations_
 
 
 def _has_default_option(field: AttributeField):
@@ -176,10 +908,7 @@ def _has_default_option(field: AttributeField):
 
 
 def _is_annotated(obj: object, name: str):
-    if not isinstance(obj, type):
-        obj = obj.__class__
-    return any([
-        (name in b.__annotations__) for b in (obj,) + obj.__bases__])
+    return name in _get_annotations(obj)
 
 
 def _is_attribute(obj: object):
@@ -215,34 +944,83 @@ def optional_dict(apply_behavior=ApplyBehavior.UPDATE):
 
 
 class APIClientABCMeta(abc.ABCMeta):
-    __required_fields__: dict[str, AttributeField]
-    __optional_fields__: dict[str, AttributeField]
+    """
+    Resolves the fields of a client class once.
+    Fields are identified when the class is made
+    and validated on its first instantiation,
+    after which only the resolved settings are
+    used.
+    """
+    __required_fields__:   dict[str, AttributeField]
+    __optional_fields__:   dict[str, AttributeField]
+    __field_annotations__: dict[str, Any]
+    __session_settings__:  tuple[tuple[str, AttributeField, Any], ...]
+
+    __validate_lock__ = threading.Lock()
 
     def __init__(cls, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        cls.__field_annotations__ = _get_annotations(cls)
         cls._identify_attributes()
 
     def _identify_attributes(cls):
-        public_attrs = _get_public_attrs(cls)
-
         _required_, _optional_ = {}, {}
-        for name, field in public_attrs:
-            if not _is_attribute(field):
-                continue
-            _ensure_annotated(cls, name)
 
-            field.annotation = _get_annotation(cls, name)
-            if not _has_default_option(field):
-                _required_.update({name: field})
+        # fields of client bases are taken from what
+        # they identified, as their attributes are
+        # replaced by values once validated.
+        for base in reversed(cls.__mro__[1:]):
+            if isinstance(base, APIClientABCMeta):
+                _required_.update(base.__required_fields__)
+                _optional_.update(base.__optional_fields__)
                 continue
+            _update_fields(base, vars(base), _required_, _optional_)
 
-            _optional_.update({name: field})
+        _update_fields(cls, vars(cls), _required_, _optional_)
 
         cls.__required_fields__ = _required_
         cls.__optional_fields__ = _optional_
 
+    def _validate_once(cls):
+        """
+        Validate the fields of this class, and
+        resolve its session settings, if not done
+        already.
+        """
+        if "__session_settings__" in cls.__dict__:
+            return
+
+        with cls.__validate_lock__:
+            if "__session_settings__" in cls.__dict__:
+                return
+            _validate_fields(cls, cls.__required_fields__)
+            _validate_fields(cls, cls.__optional_fields__)
 
-class BaseAPIClient(abc.ABC, metaclass=APIClientABCMeta):
+            cls.__session_settings__ = tuple([
+                (n, cls.__optional_fields__[n], getattr(cls, n))
+                for n in getattr(cls, "__session_fields__", ())])
+
+
+def _update_fields(cls: type, namespace: dict, required: dict, optional: dict):
+    for name, field in namespace.items():
+        if not _is_attribute(field) or "_" in name[:2]:
+            continue
+        _ensure_annotated(cls, name)
+
+        field.annotation = _get_annotation(cls, name)
+        required.pop(name, None)
+        optional.pop(name, None)
+        if not _has_default_option(field):
+            required[name] = field
+        else:
+            optional[name] = field
+
+
+class APIClientMixIn(abc.ABC, metaclass=APIClientABCMeta):
+    """
+    Fields and construction shared by the
+    blocking and async API clients.
+    """
 
     # Client specific attributes
     max_timeout:     float | tuple[float, float] = required()
@@ -250,36 +1028,17 @@ class BaseAPIClient(abc.ABC, metaclass=APIClientABCMeta):
     healthcheck_uri: str                         = optional()
 
     # Session build specific attributes
-    auth:                          str = optional()
-    cert:    str | bytes | os.PathLike = optional()
     headers:            dict[str, Any] = optional_dict()
-    hooks:              dict[str, str] = optional_dict()
     proxies:            dict[str, str] = optional_dict()
-    stream:                       bool = optional(default=False)
     verify:                       bool = optional(default=True)
 
-    __session__:        requests.Session
-    __session_fields__:        tuple[str] = (
-        "headers", "proxies", "hooks",
-        "auth", "stream", "verify", "cert"
-    )
-
     def __new__(cls, *args, **kwargs):
         cls._pre(args, kwargs)
         return cls._new(args, kwargs)
 
-    def __enter__(self):
-        return self
-
-    def __exit__(self, etype, evalue, traceback):
-        self.__session__.close()
-
     @classmethod
     def _pre(cls, args, kwargs):
-        parent = cls._get_parent_class()
-
-        _validate_fields(cls, parent.__required_fields__)
-        _validate_fields(cls, parent.__optional_fields__)
+        cls._validate_once()
 
     @classmethod
     def _new(cls, args, kwargs, init=True):
@@ -288,38 +1047,131 @@ class BaseAPIClient(abc.ABC, metaclass=APIClientABCMeta):
             inst._init(*args, **kwargs)
         return inst
 
-    @classmethod
-    def _get_parent_class(cls):
-        if cls is not BaseAPIClient:
-            return BaseAPIClient
-        return cls
+    def _init(self, *args, **kwargs):
+        self.__init__(*args, **kwargs)
+
+    def handle_http_error(self, error: Exception) -> None:
+        """Handle http protocol errors."""
+        raise
+
+    def _healthcheck_root(self):
+        return self.healthcheck_uri or self.root_uri
+
+    def _resolve_uri(self, endpoint: str | None, kwargs: dict):
+        # pops the per request overrides of the
+        # root uri and timeout from `kwargs`.
+        root, timeout = _parse_send_kwargs(self, kwargs)
+        return "/".join([root, endpoint or ""]), timeout
+
+
+class BaseAPIClient(APIClientMixIn):
+
+    # Session build specific attributes
+    auth:                          str = optional()
+    cert:    str | bytes | os.PathLike = optional()
+    hooks:              dict[str, str] = optional_dict()
+    stream:                       bool = optional(default=False)
+
+    # Connection pool specific attributes
+    pool_connections:              int = optional(default=10)
+    pool_maxsize:                  int = optional(default=10)
+    pool_block:                   bool = optional(default=False)
+    keepalive:                    bool = optional(default=True)
+    max_retries:                   int = optional(default=0)
+    retry_backoff:               float = optional(default=0.0)
+    retry_statuses:    tuple[int, ...] = optional(default=(429, 502, 503, 504))
+
+    # Response cache specific attributes
+    cache:                CacheStorage = optional()
+    cache_ttls:       dict[str, float] = optional_dict()
+
+    # Resilience specific attributes
+    breaker_failure_rate:        float = optional()
+    breaker_window:                int = optional(default=20)
+    breaker_min_calls:             int = optional(default=10)
+    breaker_cooldown:            float = optional(default=30.0)
+    hedge_after:                 float = optional()
+    hedge_percentile:            float = optional(default=0.95)
+    hedge_min_samples:             int = optional(default=20)
+    hedging:                      bool = optional(default=False)
+
+    # Rate limit specific attributes
+    rate_limit:                          float = optional()
+    rate_burst:                          float = optional()
+    rate_limit_per_endpoint:              bool = optional(default=False)
+    rate_limit_file:        str | os.PathLike = optional()
+
+    # Pagination specific attributes
+    paginator:                Paginator = optional()
+    paginate_prefetch:              int = optional(default=2)
+
+    # Instrumentation specific attributes
+    track_metrics:                         bool = optional(default=False)
+    metrics_exporters:    list[MetricsExporter] = optional(default_factory=list)
+
+    __adapter__:        PoolAdapter
+    __session__:        requests.Session
+    __session_fields__:        tuple[str] = (
+        "headers", "proxies", "hooks",
+        "auth", "stream", "verify", "cert"
+    )
+    __adapter_fields__:        tuple[str] = (
+        "pool_connections", "pool_maxsize", "pool_block",
+        "keepalive", "max_retries", "retry_backoff", "retry_statuses"
+    )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, etype, evalue, traceback):
+        self.__session__.close()
 
     def _init(self, *args, **kwargs):
         self._init_session()
-        self.__init__(*args, **kwargs)
+        super()._init(*args, **kwargs)
 
     def _init_session(self, **kwargs):
-        parent = self._get_parent_class()
-        field_names = self.__session_fields__
+        overrides = vars(self)
 
         _session_ = requests.Session()
-        for name in field_names:
-            value = getattr(self, name, None)
-            field = parent.__optional_fields__[name]
+        for name, field, value in self.__session_settings__:
+            value = overrides.get(name, value)
             field.apply(_session_, name, kwargs.get(name, value))
 
+        _adapter_ = self._init_adapter(**kwargs)
+        _session_.mount("http://", _adapter_)
+        _session_.mount("https://", _adapter_)
+
+        self.__adapter__ = _adapter_
         self.__session__ = _session_
 
-    def handle_http_error(self, error: requests.HTTPError) -> None:
-        """Handle http protocol errors."""
-        raise
+    def _init_adapter(self, **kwargs):
+        config = {n: kwargs.get(n, getattr(self, n)) for n in self.__adapter_fields__}
+
+        # retries are only made for requests which
+        # are safe to repeat.
+        retries = Retry(
+            total=config["max_retries"],
+            backoff_factor=config["retry_backoff"],
+            status_forcelist=config["retry_statuses"],
+            raise_on_status=False)
+
+        return PoolAdapter(
+            pool_connections=config["pool_connections"],
+            pool_maxsize=config["pool_maxsize"],
+            pool_block=config["pool_block"],
+            max_retries=retries,
+            socket_options=_adapter_socket_options(config["keepalive"]))
 
     def healthcheck(self) -> int:
         """Send a health check ping to api reference."""
-        uri = (self.healthcheck_uri or self.root_uri)
-        resp = self._send(RESTMethod.GET, "", root_uri=uri)
+        resp = self._send(RESTMethod.GET, "", root_uri=self._healthcheck_root())
         return resp.status_code
 
+    def pool_stats(self) -> list[PoolStats]:
+        """Usage of the session's connection pools."""
+        return self.__adapter__.pool_stats()
+
     def refresh(self, **kwargs) -> None:
         """Reset the internal client session."""
         self.__session__.close()
@@ -334,15 +1186,836 @@ class BaseAPIClient(abc.ABC, metaclass=APIClientABCMeta):
             self.handle_http_error(error)
         return resp
 
+    def send_many(
+        self, batch: Iterable[tuple], max_concurrency: int = None,
+        ordered: bool = True, deadline: float = None) -> Iterator[BatchResult]:
+        """
+        Send a batch of requests concurrently over the
+        client session. Items are `(method, endpoint)`
+        or `(method, endpoint, kwargs)`.
+
+        Yields a `BatchResult` per request, in batch
+        order or as completed. Errors are captured
+        rather than raised, and requests unfinished
+        `deadline` seconds after the call fail with
+        `TimeoutError`. Concurrency defaults to
+        `pool_maxsize` so workers never outnumber the
+        pooled connections.
+        """
+        batch   = [_parse_batch_item(i, item) for i, item in enumerate(batch)]
+        expires = None if deadline is None else time.monotonic() + deadline
+
+        executor = ThreadPoolExecutor(max_concurrency or self.pool_maxsize)
+        try:
+            futures = {
+                executor.submit(self._send_captured, result, kwargs, expires): result
+                for result, kwargs in batch}
+            yield from _collect_batch(futures, ordered, expires)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def iter_chunks(
+        self, method: RESTMethod, endpoint: str = None,
+        chunk_size: int = STREAM_CHUNK_SIZE, **kwargs) -> Iterator[bytes]:
+        """
+        Stream the response body in chunks of up to
+        `chunk_size` bytes.
+        """
+        with self._send_streamed(method, endpoint, kwargs) as resp:
+            yield from resp.iter_content(chunk_size)
+
+    def iter_json_lines(
+        self, method: RESTMethod, endpoint: str = None,
+        max_line_size: int = STREAM_BUFFER_SIZE, **kwargs) -> Iterator[Any]:
+        """
+        Stream a newline delimited JSON response,
+        decoding one line at a time. Lines longer
+        than `max_line_size` bytes are refused.
+        """
+        chunks = self.iter_chunks(method, endpoint, **kwargs)
+        for line in _iter_lines(chunks, max_line_size):
+            if line.strip():
+                yield json.loads(line)
+
+    def iter_json_array(
+        self, method: RESTMethod, endpoint: str = None,
+        max_item_size: int = STREAM_BUFFER_SIZE, **kwargs) -> Iterator[Any]:
+        """
+        Stream the items of a top level JSON array
+        without loading the whole array. Items
+        larger than `max_item_size` are refused.
+        """
+        chunks = self.iter_chunks(method, endpoint, **kwargs)
+        yield from _iter_json_array(chunks, max_item_size)
+
+    def download_to(
+        self, path: str | os.PathLike, method: RESTMethod = RESTMethod.GET,
+        endpoint: str = None, chunk_size: int = STREAM_CHUNK_SIZE, **kwargs) -> int:
+        """
+        Write the response body to `path`, returning
+        the bytes written. The body is read into one
+        reused buffer and the file is only put in
+        place once complete.
+        """
+        path = pathlib.Path(path)
+        temp = path.with_name(f".{path.name}.part")
+        buffer, written = bytearray(chunk_size), 0
+        view = memoryview(buffer)
+
+        try:
+            with self._send_streamed(method, endpoint, kwargs) as resp:
+                resp.raw.decode_content = True
+                with open(temp, "wb") as stream:
+                    _preallocate(stream, resp)
+                    while count := resp.raw.readinto(buffer):
+                        stream.write(view[:count])
+                        written += count
+                    stream.truncate(written)
+            os.replace(temp, path)
+        except:
+            temp.unlink(missing_ok=True)
+            raise
+        return written
+
+    @contextlib.contextmanager
+    def _send_streamed(self, method, endpoint, kwargs):
+        kwargs["stream"] = True
+        resp = self.send(method, endpoint, **kwargs)
+        try:
+            yield resp
+        finally:
+            resp.close()
+
+    def paginate(
+        self, endpoint: str = None, method: RESTMethod = RESTMethod.GET,
+        paginator: Paginator = None, prefetch: int = None, **kwargs) -> Iterator[Any]:
+        """
+        Lazily iterate the items of every page of
+        `endpoint`. Up to `prefetch` pages are fetched
+        in the background ahead of the caller, so
+        fetching overlaps with processing.
+        """
+        paginator = paginator or self.paginator
+        prefetch  = self.paginate_prefetch if prefetch is None else prefetch
+        if paginator is None:
+            raise ClientFieldError("no paginator given or declared on client")
+
+        pages = self._iter_pages(paginator, method, endpoint, kwargs)
+        if prefetch > 0:
+            pages = _prefetch(pages, prefetch)
+        for items in pages:
+            yield from items
+
+    def _iter_pages(self, paginator, method, endpoint, kwargs):
+        request = paginator.first(endpoint, kwargs)
+        while request is not None:
+            endpoint, kwargs = request
+            resp  = self.send(method, endpoint, **dict(kwargs))
+            items = paginator.items(resp)
+            yield items
+            request = paginator.next(resp, items, endpoint, kwargs)
+
+    def _send_captured(self, result: BatchResult, kwargs: dict, expires: float | None):
+        try:
+            if expires is not None:
+                kwargs["max_timeout"] = _deadline_timeout(
+                    kwargs.get("max_timeout", self.max_timeout), expires)
+            result.response = self.send(result.method, result.endpoint, **kwargs)
+        except (Exception, ClientLibException) as error:
+            result.error = error
+        return result
+
+    def circuit_breaker(self, endpoint: str = None, root_uri: str = None) -> CircuitBreaker | None:
+        """
+        Breaker guarding `endpoint` of `root_uri`,
+        or of the client's own root, shared by every
+        client of this class. `None` unless
+        `breaker_failure_rate` is set.
+        """
+        if self.breaker_failure_rate is None:
+            return None
+
+        breakers = _class_state(self, "breakers", dict)
+        endpoint = self._endpoint_key(endpoint, root_uri)
+        with CLASS_STATE_LOCK:
+            if endpoint not in breakers:
+                breakers[endpoint] = CircuitBreaker(
+                    self.breaker_failure_rate, self.breaker_window,
+                    self.breaker_min_calls, self.breaker_cooldown)
+            return breakers[endpoint]
+
+    def metrics_snapshot(self) -> dict[str, EndpointStats]:
+        """
+        Request stats per endpoint, shared by every
+        client of this class.
+        """
+        return _class_state(self, "metrics", RequestMetrics).snapshot()
+
     def _send(self, method: RESTMethod, endpoint: str, **kwargs):
-        uri, timeout = _parse_send_kwargs(self, kwargs)
-        uri = "/".join([uri, endpoint or ""])
+        if not (self.track_metrics or self.metrics_exporters):
+            return self._send_guarded(method, endpoint, **kwargs)
 
-        return self.__session__.request(
-            str(method),
+        start = time.monotonic()
+        try:
+            resp = self._send_guarded(method, endpoint, **kwargs)
+        except (Exception, ClientLibException) as error:
+            self._record_request(method, endpoint, start, None, error)
+            raise
+        self._record_request(method, endpoint, start, resp, None)
+        return resp
+
+    def _record_request(self, method, endpoint, start, resp, error):
+        record = _request_record(method, endpoint, time.monotonic() - start, resp, error)
+        if self.track_metrics:
+            _class_state(self, "metrics", RequestMetrics).record(record)
+        for exporter in self.metrics_exporters:
+            try:
+                exporter.export(record)
+            except Exception:
+                logging.getLogger(__name__).exception("metrics exporter failed")
+
+    def _send_guarded(self, method: RESTMethod, endpoint: str, **kwargs):
+        root    = kwargs.get("root_uri")
+        breaker = self.circuit_breaker(endpoint, root)
+        if breaker is not None:
+            breaker.acquire()
+
+        start = time.monotonic()
+        try:
+            if self._is_hedgeable(method, kwargs):
+                resp = self._send_hedged(method, endpoint, kwargs)
+            else:
+                resp = self._send_once(method, endpoint, **kwargs)
+        except requests.RequestException:
+            if breaker is not None:
+                breaker.record(False)
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        if breaker is not None:
+            breaker.record(resp.status_code < 500)
+        if self.hedging:
+            self._record_latency(self._endpoint_key(endpoint, root), time.monotonic() - start)
+        return resp
+
+    def _is_hedgeable(self, method, kwargs):
+        if not self.hedging or str(method).lower() != RESTMethod.GET:
+            return False
+        return not kwargs.get("stream", self.stream)
+
+    def _send_hedged(self, method, endpoint, kwargs):
+        """
+        Send a GET, and a duplicate of it if no
+        response arrives within the hedge delay,
+        returning the first to succeed. Raises only
+        once every attempt has failed.
+        """
+        delay = self._hedge_delay(self._endpoint_key(endpoint, kwargs.get("root_uri")))
+        if delay is None:
+            return self._send_once(method, endpoint, **kwargs)
+
+        executor = _class_state(self, "executor", lambda: ThreadPoolExecutor(self.pool_maxsize))
+        attempts = [executor.submit(self._send_once, method, endpoint, **dict(kwargs))]
+        done, _  = wait(attempts, delay)
+        if not done:
+            attempts.append(executor.submit(self._send_once, method, endpoint, **dict(kwargs)))
+
+        pending = set(attempts)
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            succeeded = [a for a in attempts if a in done and a.exception() is None]
+            if not succeeded:
+                continue
+            for loser in [*succeeded[1:], *pending]:
+                loser.add_done_callback(_close_response)
+            return succeeded[0].result()
+        raise attempts[0].exception()
+
+    def _endpoint_key(self, endpoint, root_uri=None):
+        # endpoints of the client's own root are
+        # keyed by path alone.
+        endpoint = (endpoint or "").strip("/")
+        if root_uri is None or root_uri == self.root_uri:
+            return endpoint
+        return "/".join([root_uri.rstrip("/"), endpoint])
+
+    def _hedge_delay(self, key):
+        if self.hedge_after is not None:
+            return self.hedge_after
+
+        latencies = _class_state(self, "latencies", dict).get(key)
+        if not latencies or len(latencies) < self.hedge_min_samples:
+            return None
+        ordered = sorted(latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * self.hedge_percentile))]
+
+    def _record_latency(self, key, elapsed):
+        latencies = _class_state(self, "latencies", dict)
+        if key not in latencies:
+            with CLASS_STATE_LOCK:
+                latencies.setdefault(key, collections.deque(maxlen=200))
+        latencies[key].append(elapsed)
+
+    def _send_once(self, method: RESTMethod, endpoint: str, **kwargs):
+        uri, timeout = self._resolve_uri(endpoint, kwargs)
+        if self._is_cacheable(method, kwargs):
+            return self._send_cached(endpoint, uri, timeout, kwargs)
+
+        return self._request(
+            endpoint, str(method),
             url=uri, timeout=timeout, **kwargs)
 
+    def _request(self, endpoint, method, **kwargs):
+        bucket = self.rate_limiter(endpoint)
+        if bucket is None:
+            return self.__session__.request(method, **kwargs)
+
+        bucket.acquire()
+        resp = self.__session__.request(method, **kwargs)
+        bucket.observe(resp)
+        return resp
+
+    def rate_limiter(self, endpoint: str = None) -> TokenBucket | None:
+        """
+        Bucket throttling requests to `endpoint`,
+        shared by every client of this class. `None`
+        unless `rate_limit` is set.
+        """
+        if self.rate_limit is None:
+            return None
+
+        buckets = _class_state(self, "buckets", dict)
+        key     = (endpoint or "").strip("/") if self.rate_limit_per_endpoint else ""
+        if key in buckets:
+            return buckets[key]
+
+        path = self.rate_limit_file
+        if path is not None and key:
+            path = f"{path}.{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+        with CLASS_STATE_LOCK:
+            if key not in buckets:
+                buckets[key] = TokenBucket(self.rate_limit, self.rate_burst, path)
+            return buckets[key]
+
+    def _is_cacheable(self, method, kwargs):
+        if self.cache is None or str(method).lower() != RESTMethod.GET:
+            return False
+        if kwargs.get("stream", self.stream):
+            return False
+        return "no-store" not in _cache_directives(kwargs.get("headers") or {})
+
+    def _send_cached(self, endpoint, uri, timeout, kwargs):
+        """
+        GET through the response cache. Fresh entries
+        are returned as they are, stale ones are
+        revalidated with `If-None-Match` and
+        `If-Modified-Since`.
+        """
+        headers = requests.structures.CaseInsensitiveDict(kwargs.pop("headers", None) or {})
+        request = requests.Request("GET", uri, params=kwargs.pop("params", None))
+        key     = self.__session__.prepare_request(request).url
+        sent    = requests.structures.CaseInsensitiveDict(self.__session__.headers)
+        sent.update(headers)
+        now     = time.time()
+
+        entry = self.cache.get(key)
+        if entry is not None and entry.vary != _vary_headers(entry.response, sent):
+            entry = None
+
+        revalidate = "no-cache" in _cache_directives(headers)
+        if entry is not None and entry.is_fresh(now) and not revalidate:
+            return _clone_response(entry.response, from_cache=True)
+
+        if entry is not None:
+            if entry.etag:
+                headers.setdefault("If-None-Match", entry.etag)
+            if entry.last_modified:
+                headers.setdefault("If-Modified-Since", entry.last_modified)
+
+        resp = self._request(
+            endpoint, "get",
+            url=key, timeout=timeout, headers=headers, **kwargs)
+
+        from_cache = entry is not None and resp.status_code == 304
+        if from_cache:
+            entry.response.headers.update(resp.headers)
+            resp = entry.response
+
+        ttl      = self.cache_ttls.get((endpoint or "").strip("/"))
+        lifetime = _cache_lifetime(resp, ttl)
+        stored   = _clone_response(resp)
+
+        if resp.status_code not in CACHEABLE_STATUSES or lifetime is None:
+            self.cache.delete(key)
+        elif lifetime > 0 or "ETag" in stored.headers or "Last-Modified" in stored.headers:
+            vary = _vary_headers(stored, sent)
+            self.cache.set(key, CacheEntry(stored, now + lifetime, vary))
+
+        return _clone_response(stored, from_cache=from_cache)
+
+
+class AsyncBaseAPIClient(APIClientMixIn):
+
+    # Session build specific attributes
+    auth:       tuple[str, str] | aiohttp.BasicAuth = optional()
+    cert:                       str | os.PathLike = optional()
+
+    # Connection pool specific attributes
+    pool_maxsize:                             int = optional(default=100)
+    pool_maxsize_per_host:                    int = optional(default=0)
+    keepalive_timeout:                      float = optional(default=15.0)
+
+    __session__: aiohttp.ClientSession | None = None
+
+    async def __aenter__(self):
+        await self._init_session()
+        return self
 
-def _parse_send_kwargs(client: BaseAPIClient, kwargs: dict):
+    async def __aexit__(self, etype, evalue, traceback):
+        await self.close()
+
+    async def _init_session(self, **kwargs):
+        # sessions bind to the running loop, so one
+        # is only made once a loop is available.
+        if self.__session__ is not None and not self.__session__.closed:
+            return
+
+        config = lambda n: kwargs.get(n, getattr(self, n))
+        auth   = config("auth")
+        if isinstance(auth, tuple):
+            auth = aiohttp.BasicAuth(*auth)
+
+        connector = aiohttp.TCPConnector(
+            limit=config("pool_maxsize"),
+            limit_per_host=config("pool_maxsize_per_host"),
+            keepalive_timeout=config("keepalive_timeout"),
+            ssl=_ssl_context(config("verify"), config("cert")))
+
+        self.__session__ = aiohttp.ClientSession(
+            auth=auth,
+            connector=connector,
+            headers=config("headers"),
+            timeout=_client_timeout(config("max_timeout")))
+
+    async def close(self) -> None:
+        """Close the internal client session."""
+        if self.__session__ is not None:
+            await self.__session__.close()
+        self.__session__ = None
+
+    async def healthcheck(self) -> int:
+        """Send a health check ping to api reference."""
+        resp = await self._send(RESTMethod.GET, "", root_uri=self._healthcheck_root())
+        return resp.status
+
+    async def refresh(self, **kwargs) -> None:
+        """Reset the internal client session."""
+        await self.close()
+        await self._init_session(**kwargs)
+
+    async def send(self, method: RESTMethod, endpoint: str = None, **kwargs) -> aiohttp.ClientResponse:
+        """
+        Send a request using the API Client settings.
+        The body is read before the response is
+        returned, releasing its connection.
+        """
+        try:
+            resp = await self._send(method, endpoint, **kwargs)
+            resp.raise_for_status()
+        except aiohttp.ClientError as error:
+            self.handle_http_error(error)
+        return resp
+
+    async def _send(self, method: RESTMethod, endpoint: str, **kwargs):
+        await self._init_session()
+
+        uri, timeout = self._resolve_uri(endpoint, kwargs)
+        kwargs.setdefault("proxy", self.proxies.get(uri.split(":", 1)[0]))
+
+        async with self.__session__.request(
+            str(method),
+            uri, timeout=_client_timeout(timeout), **kwargs) as resp:
+            await resp.read()
+        return resp
+
+
+def _iter_lines(chunks: Iterable[bytes], max_size: int):
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            yield bytes(buffer[start:end])
+            start = end + 1
+        del buffer[:start]
+        if len(buffer) > max_size:
+            raise ClientResponseError(f"line exceeds {max_size} bytes")
+    if buffer:
+        yield bytes(buffer)
+
+
+def _iter_json_array(chunks: Iterable[bytes], max_size: int):
+    decoder = json.JSONDecoder()
+    chunks  = iter(chunks)
+
+    # `buffer` holds raw bytes from `pos` on, so its
+    # size is the size of the unread part. `expect`
+    # is one of "[", "first", "item" or "separator".
+    buffer, pos, done = bytearray(), 0, False
+    expect, scanner   = "[", None
+
+    def fill():
+        nonlocal pos, done
+        chunk = next(chunks, None)
+        done  = chunk is None
+        del buffer[:pos]
+        buffer.extend(chunk or b"")
+        pos = 0
+        if len(buffer) > max_size:
+            raise ClientResponseError(f"array item exceeds {max_size} bytes")
+
+    while True:
+        pos = JSON_WHITESPACE.match(buffer, pos).end()
+        if pos == len(buffer):
+            if done:
+                raise ClientResponseError("unexpected end of JSON array")
+            fill()
+            continue
+
+        char = buffer[pos:pos + 1]
+        if expect == "[":
+            if char != b"[":
+                raise ClientResponseError("response is not a JSON array")
+            expect, pos = "first", pos + 1
+            continue
+        if expect == "separator":
+            if char == b"]":
+                return
+            if char != b",":
+                raise ClientResponseError("expected ',' or ']' after JSON array item")
+            expect, pos = "item", pos + 1
+            continue
+        if char == b"]" and expect == "first":
+            return
+        if char in (b",", b"]"):
+            raise ClientResponseError("expected JSON array item")
+
+        # only decode once the scanner has seen the
+        # whole value, however many chunks it spans.
+        scanner = scanner or _JSONValueScanner()
+        end     = scanner.end(buffer, pos, done)
+        if end is None:
+            if done:
+                raise ClientResponseError("unexpected end of JSON array")
+            fill()
+            continue
+        try:
+            text      = buffer[pos:end].decode()
+            item, off = decoder.raw_decode(text)
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            raise ClientResponseError("malformed JSON array item") from None
+        if off != len(text):
+            raise ClientResponseError("malformed JSON array item")
+
+        yield item
+        expect, pos, scanner = "separator", end, None
+
+
+class _JSONValueScanner:
+    """
+    Finds the end of the JSON value starting at
+    `start` of a growing buffer, resuming where the
+    previous call stopped.
+    """
+
+    def __init__(self):
+        self.offset    = 0
+        self.depth     = 0
+        self.in_string = False
+
+    def end(self, buffer: bytearray, start: int, done: bool) -> int | None:
+        pos = start + self.offset
+        if buffer[start:start + 1] not in (b"[", b"{", b'"'):
+            end = max(JSON_SCALAR.match(buffer, pos).end(), start + 1)
+            if end == len(buffer) and not done:
+                self.offset = end - start
+                return None
+            return end
+
+        while True:
+            if self.in_string:
+                match = JSON_STRING_END.search(buffer, pos)
+                if match is None or match.group() == b"\\" and match.end() == len(buffer):
+                    break
+                if match.group() == b"\\":
+                    pos = match.end() + 1
+                    continue
+                self.in_string, pos = False, match.end()
+                if not self.depth:
+                    return pos
+                continue
+
+            match = JSON_STRUCTURE.search(buffer, pos)
+            if match is None:
+                break
+            char, pos = match.group(), match.end()
+            if char == b'"':
+                self.in_string = True
+            elif char in (b"[", b"{"):
+                self.depth += 1
+            else:
+                self.depth -= 1
+                if not self.depth:
+                    return pos
+
+        # resume from the last unfinished token.
+        self.offset = (len(buffer) if match is None else match.start()) - start
+        return None
+
+
+def _preallocate(stream, response: requests.Response):
+    length = response.headers.get("Content-Length", "")
+    if not length.isdigit() or response.headers.get("Content-Encoding"):
+        return
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(stream.fileno(), 0, int(length))
+            return
+        except OSError:
+            pass
+    stream.truncate(int(length))
+
+
+def _class_state(client: object, name: str, factory: Callable[[], Any]):
+    # state shared by every instance of a client
+    # class, but not with its subclasses.
+    cls  = type(client)
+    name = f"__{name}_state__"
+    with CLASS_STATE_LOCK:
+        if name not in cls.__dict__:
+            setattr(cls, name, factory())
+    return cls.__dict__[name]
+
+
+def _request_record(method, endpoint, elapsed, resp, error):
+    record = RequestRecord(
+        str(method).lower(), (endpoint or "").strip("/"), None, elapsed, None, 0, 0,
+        error=None if error is None else type(error).__name__)
+    if resp is None:
+        return record
+
+    record.status     = resp.status_code
+    record.ttfb       = resp.elapsed.total_seconds()
+    record.from_cache = getattr(resp, "from_cache", False)
+
+    retries = getattr(resp.raw, "retries", None)
+    if retries is not None:
+        record.retries = len(retries.history)
+
+    body = getattr(resp.request, "body", None)
+    if isinstance(body, (bytes, str)):
+        record.bytes_sent = len(body)
+
+    # streamed bodies are not read here, their
+    # size is taken from the headers instead.
+    if resp._content_consumed and resp._content:
+        record.bytes_received = len(resp._content)
+    elif resp.headers.get("Content-Length", "").isdigit():
+        record.bytes_received = int(resp.headers["Content-Length"])
+    return record
+
+
+def _close_response(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+def _dotted_get(data: Any, key: str | None):
+    for part in (key.split(".") if key else ()):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(part)
+    return data
+
+
+def _prefetch(pages: Iterator[list], size: int):
+    # pages are fetched by a worker thread into a
+    # bounded buffer, stopping when the consumer
+    # goes away.
+    buffer, stopped, done = queue.Queue(size), threading.Event(), object()
+
+    def put(item):
+        while not stopped.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def fetch():
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+        except (Exception, ClientLibException) as error:
+            put((None, error))
+            return
+        put((done, None))
+
+    worker = threading.Thread(target=fetch, daemon=True)
+    worker.start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if error is not None:
+                raise error
+            if page is done:
+                return
+            yield page
+    finally:
+        stopped.set()
+
+
+def _with_params(kwargs: dict, params: dict):
+    return {**kwargs, "params": {**(kwargs.get("params") or {}), **params}}
+
+
+@contextlib.contextmanager
+def _locked_file(path: pathlib.Path | None):
+    if path is None:
+        yield None
+        return
+
+    with open(path, "a+b") as stream:
+        if fcntl is not None:
+            fcntl.flock(stream, fcntl.LOCK_EX)
+        else:
+            stream.seek(0)
+            msvcrt.locking(stream.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield stream
+        finally:
+            if fcntl is not None:
+                fcntl.flock(stream, fcntl.LOCK_UN)
+            else:
+                stream.seek(0)
+                msvcrt.locking(stream.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _load_bucket(stream, default: dict):
+    stream.seek(0)
+    try:
+        return {**default, **json.loads(stream.read() or b"{}")}
+    except ValueError:
+        return dict(default)
+
+
+def _save_bucket(stream, state: dict):
+    stream.seek(0)
+    stream.truncate()
+    stream.write(json.dumps(state).encode())
+    stream.flush()
+
+
+def _ratelimit_reset(value: str | None):
+    # seconds until the window resets, given as
+    # either a delta or an epoch timestamp.
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > 1e9:
+        reset -= time.time()
+    return max(0.0, reset)
+
+
+def _retry_after(value: str | None):
+    if not value:
+        return None
+    if value.strip().isdigit():
+        return float(value)
+    date = _http_date(value)
+    return None if date is None else max(0.0, date - time.time())
+
+
+def _collect_batch(futures: dict, ordered: bool, expires: float | None):
+    remaining = lambda: None if expires is None else max(0.0, expires - time.monotonic())
+
+    if ordered:
+        for future, result in futures.items():
+            try:
+                yield future.result(remaining())
+            except FutureTimeoutError:
+                yield _timed_out(result)
+        return
+
+    done = set()
+    try:
+        for future in as_completed(futures, remaining()):
+            done.add(future)
+            yield future.result()
+    except FutureTimeoutError:
+        for future, result in futures.items():
+            if future not in done:
+                yield _timed_out(result)
+
+
+def _deadline_timeout(timeout: float | tuple[float, float], expires: float):
+    remaining = expires - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("deadline expired before request was sent")
+    if isinstance(timeout, tuple):
+        return tuple([min(t, remaining) for t in timeout])
+    return min(timeout, remaining)
+
+
+def _parse_batch_item(index: int, item: tuple):
+    method, endpoint, kwargs = (tuple(item) + ({},))[:3]
+    return BatchResult(index, method, endpoint), dict(kwargs)
+
+
+def _timed_out(result: BatchResult):
+    # copied, as the worker may still finish and
+    # write to the original.
+    error = TimeoutError("deadline expired before response was received")
+    return dataclasses.replace(result, response=None, error=error)
+
+
+def _client_timeout(timeout: float | tuple[float, float]):
+    if isinstance(timeout, tuple):
+        connect, read = timeout
+        return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+    return aiohttp.ClientTimeout(total=timeout)
+
+
+def _ssl_context(verify: bool | str, cert: str | os.PathLike | tuple | None):
+    if verify is True and not cert:
+        return True
+    if verify is False:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode    = ssl.CERT_NONE
+    elif isinstance(verify, (str, os.PathLike)):
+        context = ssl.create_default_context(cafile=verify)
+    else:
+        context = ssl.create_default_context()
+
+    if cert:
+        context.load_cert_chain(*(cert if isinstance(cert, tuple) else (cert,)))
+    return context
+
+
+def _adapter_socket_options(keepalive: bool):
+    options = list(HTTPConnection.default_socket_options)
+    if keepalive:
+        options.extend(_keepalive_options())
+    return options
+
+
+def _parse_send_kwargs(client: APIClientMixIn, kwargs: dict):
     parse = lambda n: kwargs.pop(n, getattr(client, n))
     return parse("root_uri"), parse("max_timeout")
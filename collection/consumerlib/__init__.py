@@ -1,11 +1,17 @@
 from consumerlib.controllers import AsyncController, BaseController, Controller, ListenState
-from consumerlib.clients import BaseClient, AsyncClient, DatabaseClient, ConnectState
-from consumerlib.helpers.maps import ClientMap, EventMap, FetchMap, ParamMap, Parameter
+from consumerlib.clients import                                 \
+                BaseClient, AsyncClient, AsyncDatabaseClient,   \
+                DatabaseClient, PooledDatabaseClient,           \
+                ReplicatedDatabaseClient, ConnectState
+from consumerlib.helpers.limits import AdaptiveLimit, RateLimit
+from consumerlib.helpers.maps import ClientMap, EventMap, FetchMap, ParamMap, Parameter, RateMap
 
 
 __all__ = (
     "AsyncController", "BaseController", "Controller", "ClientMap",
     "EventMap", "ListenState", "BaseClient", "AsyncClient",
     "DatabaseClient", "ConnectState", "FetchMap", "ParamMap",
-    "Parameter"
+    "Parameter", "AdaptiveLimit", "RateLimit", "RateMap",
+    "PooledDatabaseClient", "AsyncDatabaseClient",
+    "ReplicatedDatabaseClient"
 )
@@ -1,5 +1,12 @@
-from consumerlib.clients.base import BaseClient, AsyncClient, DatabaseClient
+from consumerlib.clients.base import                            \
+                BaseClient, AsyncClient, AsyncDatabaseClient,   \
+                DatabaseClient, PooledDatabaseClient,           \
+                ReplicatedDatabaseClient
 from consumerlib.clients.maps import ConnectState
 
 
-__all__ = ("BaseClient", "AsyncClient", "DatabaseClient", "ConnectState")
+__all__ = (
+    "BaseClient", "AsyncClient", "DatabaseClient",
+    "PooledDatabaseClient", "AsyncDatabaseClient",
+    "ReplicatedDatabaseClient", "ConnectState"
+)
@@ -2,7 +2,9 @@ from consumerlib.clients.maps import ConnectState
 from consumerlib.clients.mixins import                             \
                 ClientDatabaseMixIn, ClientHostsMixIn,          \
                 ClientInitMixin, ClientContextMixIn,            \
-                AsyncClientHostsMixIn, AsyncClientContextMixIn
+                ClientPoolMixIn, ClientReplicaMixIn,            \
+                AsyncClientHostsMixIn, AsyncClientContextMixIn, \
+                AsyncClientDatabaseMixIn
 from consumerlib.helpers.typedefs import ClientType
 
 
@@ -24,12 +26,36 @@ class BaseClient(ClientInitMixin, ClientHostsMixIn, metaclass=ClientType):
             self._logger.error(f"failed disconnection from {class_name}:", exc_info=True)
             raise failure
 
+    def healthcheck(self) -> bool:
+        try:
+            return self._healthcheck()
+        except Exception:
+            class_name = (self.__class__).__name__
+            self._logger.warning(f"failed health check of {class_name}:", exc_info=True)
+            return False
+
 
 class DatabaseClient(BaseClient, ClientDatabaseMixIn, ClientContextMixIn):
     """Use this class to create a DAO client."""
     pass
 
 
+class PooledDatabaseClient(BaseClient, ClientPoolMixIn, ClientContextMixIn):
+    """
+    Use this class to create a DAO client shared
+    by concurrent handlers.
+    """
+    pass
+
+
+class ReplicatedDatabaseClient(BaseClient, ClientReplicaMixIn, ClientContextMixIn):
+    """
+    Use this class to create a DAO client that
+    reads from replicas of its primary host.
+    """
+    pass
+
+
 class AsyncClient(ClientInitMixin, AsyncClientHostsMixIn, metaclass=ClientType):
 
     async def connect(self):
@@ -47,3 +73,16 @@ class AsyncClient(ClientInitMixin, AsyncClientHostsMixIn, metaclass=ClientType):
             class_name = (self.__class__).__name__
             self._logger.error(f"failed disconnection from {class_name}:", exc_info=True)
             raise failure
+
+    async def healthcheck(self) -> bool:
+        try:
+            return await self._healthcheck()
+        except Exception:
+            class_name = (self.__class__).__name__
+            self._logger.warning(f"failed health check of {class_name}:", exc_info=True)
+            return False
+
+
+class AsyncDatabaseClient(AsyncClient, AsyncClientDatabaseMixIn, AsyncClientContextMixIn):
+    """Use this class to create an async DAO client."""
+    pass
@@ -1,13 +1,33 @@
+import functools
+import io
+import itertools
+import re
 import sqlite3
+import time
+import weakref
 
 from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager, closing, contextmanager
 from logging import Logger
-from typing import Any, Callable, Mapping, Tuple, Union
+from typing import Any, Callable, Iterable, List, Mapping, Sequence, Tuple, Union
 
 import psycopg2
+import psycopg2.extras
+import psycopg2.sql
 
 from consumerlib.clients.maps import ConnectState
-from consumerlib.helpers.maps import FetchMap, ParamMap, Parameter
+from consumerlib.helpers.aio import AsyncConnection, maybe_await, threaded
+from consumerlib.helpers.caches import ResultCache
+from consumerlib.helpers.maps import FetchMap, ParamMap, Parameter, StreamFetch
+from consumerlib.helpers.metrics import QueryMetrics, QueryStats, fingerprint
+from consumerlib.helpers.pools import AsyncConnectionPool, ConnectionPool, PooledCursor, PoolStats
+from consumerlib.helpers.replicas import Replica, ReplicaSet
+from consumerlib.helpers.statements import PREPARABLE, StatementCache, StatementStats, run_guarded
+
+
+HEALTHCHECK_QUERY = "SELECT 1"
+READONLY_QUERY    = re.compile(r"^\s*(select|with|show|explain|values)\b", re.I)
+WRITE_CLAUSE      = re.compile(r"\b(insert|update|delete|merge|into|for\s+(update|share))\b", re.I)
 
 
 class BaseClientMixIn:
@@ -73,6 +93,11 @@ class ClientInitMixin(BaseClientMixIn):
             value = self._settings[setting.name]
             setting.validate_and_set(value)
             _connect_params[key] = setting.value
+
+        # clients are used by handlers on threads
+        # other than the one that connected them.
+        if self.__class__.connectable is sqlite3.connect:
+            _connect_params.setdefault("check_same_thread", False)
         return _connect_params
 
 
@@ -88,6 +113,10 @@ class ClientABCMixIn(BaseClientMixIn, ABC):
         """Disconnect from target host."""
         return NotImplemented
 
+    def healthcheck(self) -> bool:
+        """Check the connection to target host."""
+        return self._healthcheck()
+
 
 class ClientHostsMixIn(ClientABCMixIn, BaseClientMixIn):
 
@@ -109,6 +138,9 @@ class ClientHostsMixIn(ClientABCMixIn, BaseClientMixIn):
         finally:
             self._connect_state = ConnectState.CLOSED
 
+    def _healthcheck(self) -> bool:
+        return self._connect_state is ConnectState.OPEN
+
 
 class ClientContextMixIn(ClientHostsMixIn, BaseClientMixIn):
 
@@ -121,9 +153,71 @@ class ClientContextMixIn(ClientHostsMixIn, BaseClientMixIn):
         self._close()
 
 
-class ClientDatabaseMixIn(ClientHostsMixIn, BaseClientMixIn):
+class ClientMetricsMixIn(BaseClientMixIn):
+    # record query timings by fingerprint, queries
+    # slower than `slow_query_threshold` seconds are
+    # also logged with their plan.
+    track_queries        = False
+    slow_query_threshold = None
+
+    _query_metrics = None
+
+    @property
+    def query_stats(self) -> List[QueryStats]:
+        if self._query_metrics is None:
+            return []
+        return self._query_metrics.snapshot()
+
+    def _tracking_queries(self):
+        return self.track_queries or self.slow_query_threshold is not None
+
+    def _record_query(self, query, acquire, execute, fetch, rows):
+        if self._query_metrics is None:
+            self._query_metrics = QueryMetrics()
+
+        elapsed = acquire + execute + fetch
+        slow    = self.slow_query_threshold is not None and elapsed >= self.slow_query_threshold
+        self._query_metrics.record(query, acquire, execute, fetch, rows, slow)
+        return slow
+
+    def _log_slow_query(self, query, elapsed, plan):
+        message = f"slow query [{elapsed:.3f}s]: {fingerprint(query)}"
+        if plan:
+            message += "\n\t".join(["", *plan])
+        self._logger.warning(message)
+
+
+class ClientDatabaseMixIn(ClientHostsMixIn, ClientMetricsMixIn, BaseClientMixIn):
     connectable = psycopg2.connect
 
+    # executions of the same query text before it is
+    # prepared server side, `None` prepares only
+    # queries passed to `prepare`.
+    prepare_threshold = None
+    prepare_capacity  = 100
+
+    _prepared_queries = frozenset()
+    _statement_caches = None
+
+    @property
+    def statement_stats(self) -> StatementStats:
+        stats = StatementStats()
+        for cache in list((self._statement_caches or {}).values()):
+            cache_stats      = cache.stats()
+            stats.prepared  += cache_stats.prepared
+            stats.hits      += cache_stats.hits
+            stats.evictions += cache_stats.evictions
+            for query, hits in cache_stats.queries.items():
+                stats.queries[query] = stats.queries.get(query, 0) + hits
+        return stats
+
+    def prepare(self, query: str):
+        """
+        Prepare `query` server side on each
+        connection it is executed on.
+        """
+        self._prepared_queries = self._prepared_queries | {query}
+
     def cursor(self, **kwargs):
         if self._connect_state is ConnectState.CLOSED:
             self._connect()
@@ -144,19 +238,558 @@ class ClientDatabaseMixIn(ClientHostsMixIn, BaseClientMixIn):
         if self._connect_state is ConnectState.CLOSED:
             return # need to define a not connected error
         fetch = self._parse_fetch_method(fetch)
+        if isinstance(fetch, StreamFetch):
+            return self._stream(query, params, fetch)
         return self._execute(query, params, fetch)
 
+    def executemany(
+        self, query: str, params_seq: Iterable[Union[Mapping[str, Any], Tuple]],
+        page_size: int = 100, commit: bool = False) -> int:
+        """
+        Execute a statement against each parameter set,
+        sent to the host in pages of `page_size`.
+        Returns the number of parameter sets sent.
+        """
+        if self._connect_state is ConnectState.CLOSED:
+            return
+        return self._execute_bulk(_executemany, query, params_seq, page_size, commit)
+
+    def execute_values(
+        self, query: str, rows: Iterable[Sequence], template: str = None,
+        page_size: int = 100, commit: bool = False) -> int:
+        """
+        Execute an `INSERT ... VALUES %s` statement
+        with `page_size` rows per statement.
+        Returns the number of rows sent.
+        """
+        if self._connect_state is ConnectState.CLOSED:
+            return
+        execute = functools.partial(_execute_values, template=template)
+        return self._execute_bulk(execute, query, rows, page_size, commit)
+
+    def copy_from(
+        self, table: str, rows: Iterable[Sequence], columns: Sequence[str] = None,
+        page_size: int = 10000, commit: bool = False) -> int:
+        """
+        Stream rows into `table` with `COPY FROM STDIN`,
+        buffering `page_size` rows in memory at a time.
+        Returns the number of rows sent.
+        """
+        if self._connect_state is ConnectState.CLOSED:
+            return
+        return self._execute_bulk(_copy_from, _copy_query(table, columns), rows, page_size, commit)
+
+    def _execute_bulk(self, execute, query, rows, page_size, commit):
+        count = 0
+        with self._checkout() as connection:
+            with closing(connection.cursor()) as cursor:
+                for page in _paginate(rows, page_size):
+                    execute(cursor, query, page)
+                    count += len(page)
+                    if commit:
+                        connection.commit()
+        return count
+
     def _execute(self, query, params, fetch):
-        with self._cursor() as cursor:
-            cursor.execute(query, params)
-            result = fetch(cursor)
+        start = time.perf_counter()
+        with self._checkout() as connection:
+            acquire = time.perf_counter() - start
+            return self._execute_on(connection, query, params, fetch, acquire)
+
+    def _execute_on(self, connection, query, params, fetch, acquire=0.0):
+        sent, bound = self._prepared_statement(connection, query, params)
+        with closing(connection.cursor()) as cursor:
+            start    = time.perf_counter()
+            cursor.execute(sent, bound)
+            executed = time.perf_counter()
+            result   = fetch(cursor)
+            fetched  = time.perf_counter()
+            rows     = _row_count(cursor, result)
+
+        if self._tracking_queries():
+            self._track_query(
+                connection, query, params,
+                acquire, executed - start, fetched - executed, rows)
         return result
 
+    def _stream(self, query, params, fetch):
+        # the query runs on the first iteration, and
+        # the connection is held until the iterator
+        # is exhausted or closed.
+        start = time.perf_counter()
+        with self._checkout() as connection:
+            acquire = time.perf_counter() - start
+            yield from self._stream_on(connection, query, params, fetch, acquire)
+
+    def _stream_on(self, connection, query, params, fetch, acquire=0.0):
+        # a server side cursor opens a transaction,
+        # ended here unless the caller already had one.
+        owned = _opens_transaction(connection, fetch)
+        try:
+            yield from self._stream_rows(connection, query, params, fetch, acquire)
+        except BaseException:
+            if owned:
+                connection.rollback()
+            raise
+        if owned:
+            connection.commit()
+
+    def _stream_rows(self, connection, query, params, fetch, acquire):
+        with closing(self._stream_cursor(connection, fetch)) as cursor:
+            start = time.perf_counter()
+            cursor.execute(query, params)
+            execute = time.perf_counter() - start
+
+            if not self._tracking_queries():
+                yield from fetch.iter(cursor)
+                return
+
+            rows, fetch_time = 0, 0.0
+            results = fetch.iter(cursor)
+            while True:
+                start = time.perf_counter()
+                item  = next(results, _MISSING)
+                fetch_time += time.perf_counter() - start
+                if item is _MISSING:
+                    break
+                rows += len(item) if fetch.batches else 1
+                yield item
+
+        self._track_query(connection, query, params, acquire, execute, fetch_time, rows)
+
+    def _track_query(self, connection, query, params, acquire, execute, fetch, rows):
+        if self._record_query(query, acquire, execute, fetch, rows):
+            plan = self._explain(connection, query, params)
+            self._log_slow_query(query, acquire + execute + fetch, plan)
+
+    def _explain(self, connection, query, params):
+        if not isinstance(connection, psycopg2.extensions.connection):
+            return []
+        if not query.lstrip().lower().startswith(PREPARABLE):
+            return []
+        rows = run_guarded(connection, f"EXPLAIN {query}", params)
+        return [r[0] for r in rows or []]
+
+    def _stream_cursor(self, connection, fetch):
+        if fetch.server_side and isinstance(connection, psycopg2.extensions.connection):
+            cursor = connection.cursor(
+                name=f"stream_{next(_cursor_names)}", withhold=connection.autocommit)
+            cursor.itersize = fetch.size
+            return cursor
+        return connection.cursor()
+
+    @contextmanager
+    def _checkout(self):
+        yield self._connection
+
+    def _prepared_statement(self, connection, query, params):
+        force = query in self._prepared_queries
+        if not (force or self.prepare_threshold):
+            return query, params
+        if not isinstance(connection, psycopg2.extensions.connection):
+            return query, params
+
+        statement = self._statement_cache(connection).get(connection, query, force)
+        if statement is None:
+            return query, params
+        return statement.execute_query, statement.bind(params)
+
+    def _statement_cache(self, connection):
+        if self._statement_caches is None:
+            self._statement_caches = weakref.WeakKeyDictionary()
+
+        cache = self._statement_caches.get(connection)
+        if cache is None:
+            cache = StatementCache(self.prepare_capacity, self.prepare_threshold)
+            self._statement_caches[connection] = cache
+        return cache
+
     def _parse_fetch_method(self, method: Union[str, FetchMap]):
         if isinstance(method, str):
             return FetchMap[method.upper()]
         return method
 
+    def _healthcheck(self) -> bool:
+        if self._connect_state is not ConnectState.OPEN:
+            return False
+        with self._checkout() as connection:
+            with closing(connection.cursor()) as cursor:
+                cursor.execute(HEALTHCHECK_QUERY)
+        return True
+
+
+class ClientReplicaMixIn(ClientDatabaseMixIn, BaseClientMixIn):
+    # setting listing replica hosts, as "host" or
+    # "host:port", swapped into the connect params.
+    replica_hosts       = Parameter("DATABASE_REPLICAS", type_factory=lambda v: _split_hosts(v))
+    replica_host_param  = "host"
+    replica_port_param  = "port"
+    replica_retry_after = 30.0
+    replica_pool_size   = 4
+    result_cache_size   = 1024
+
+    _replicas:     ReplicaSet
+    _result_cache: ResultCache
+
+    @property
+    def replicas(self):
+        return self._replicas
+
+    @property
+    def result_cache(self):
+        return self._result_cache
+
+    def execute(
+        self, query: str, params: Union[Mapping[str, Any], Tuple], fetch=FetchMap.NONE,
+        readonly: bool = None, cache_ttl: float = None):
+        """
+        Execute a query, routing reads to the least
+        busy replica and falling back to the primary.
+        Reads given a `cache_ttl` are served from the
+        result cache, which is cleared once a write
+        has run and again as it is committed.
+        """
+        if self._connect_state is ConnectState.CLOSED:
+            return # need to define a not connected error
+        fetch = self._parse_fetch_method(fetch)
+
+        if readonly is None:
+            readonly = _is_readonly(query)
+        if not readonly:
+            return self._execute_write(query, params, fetch)
+
+        if isinstance(fetch, StreamFetch):
+            return self._stream_read(query, params, fetch)
+        if not cache_ttl:
+            return self._execute_read(query, params, fetch)
+
+        key    = (query, repr(params), fetch)
+        result = self._result_cache.get(key, _MISSING)
+        if result is _MISSING:
+            result = self._execute_read(query, params, fetch)
+            self._result_cache.set(key, result, cache_ttl)
+        return list(result) if isinstance(result, list) else result
+
+    def _execute_write(self, query, params, fetch):
+        try:
+            result = super().execute(query, params, fetch)
+        finally:
+            self._result_cache.clear()
+        if isinstance(fetch, StreamFetch):
+            return self._invalidating(result)
+        return result
+
+    def _invalidating(self, results):
+        try:
+            yield from results
+        finally:
+            self._result_cache.clear()
+
+    def _execute_bulk(self, execute, query, rows, page_size, commit):
+        try:
+            return super()._execute_bulk(execute, query, rows, page_size, commit)
+        finally:
+            self._result_cache.clear()
+
+    def _cursor(self, **kwargs):
+        return _InvalidatingCursor(super()._cursor(**kwargs), self._result_cache)
+
+    def _commit(self):
+        try:
+            super()._commit()
+        finally:
+            self._result_cache.clear()
+
+    def _connect(self) -> None:
+        super()._connect()
+        self._result_cache = ResultCache(self.result_cache_size)
+        self._replicas     = self._init_replicas()
+        for replica in self._replicas.connect():
+            self._logger.warning(f"failed connecting to replica {replica.host!r}.")
+
+    def _close(self) -> None:
+        try:
+            self._replicas.close()
+        finally:
+            super()._close()
+
+    def _init_replicas(self):
+        value = self._settings.get(self.replica_hosts.name)
+        self.replica_hosts.validate_and_set(value)
+
+        replicas = []
+        for host in self.replica_hosts.value:
+            params  = self._replica_params(host)
+            factory = functools.partial(_open_replica, self.__class__.connectable, params)
+            replicas.append(Replica(host, factory))
+        return ReplicaSet(replicas, self.replica_retry_after, self.replica_pool_size)
+
+    def _replica_params(self, host):
+        params = dict(self._connect_params)
+        host, _, port = host.partition(":")
+        params[self.replica_host_param] = host
+        if port:
+            params[self.replica_port_param] = int(port)
+        return params
+
+    def _execute_read(self, query, params, fetch):
+        for replica in self._replicas.candidates():
+            try:
+                with self._replicas.checkout(replica) as connection:
+                    return self._execute_on(connection, query, params, fetch)
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                self._logger.warning(f"replica {replica.host!r} failed, trying next host.")
+                self._replicas.mark_down(replica)
+        return self._execute(query, params, fetch)
+
+    def _stream_read(self, query, params, fetch):
+        # fails over like `_execute_read`, but only
+        # until the first row has been handed out.
+        for replica in self._replicas.candidates():
+            started = False
+            try:
+                with self._replicas.checkout(replica) as connection:
+                    for item in self._stream_on(connection, query, params, fetch):
+                        started = True
+                        yield item
+                return
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                if started:
+                    raise
+                self._logger.warning(f"replica {replica.host!r} failed, trying next host.")
+                self._replicas.mark_down(replica)
+        yield from self._stream(query, params, fetch)
+
+
+class _InvalidatingCursor:
+    # a client cursor that clears `cache` after
+    # each statement that may write.
+
+    def __init__(self, cursor, cache: ResultCache):
+        self._cursor = cursor
+        self._cache  = cache
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._cursor.close()
+
+    def execute(self, query, *args, **kwargs):
+        try:
+            return self._cursor.execute(query, *args, **kwargs)
+        finally:
+            self._invalidate(query)
+
+    def executemany(self, query, *args, **kwargs):
+        try:
+            return self._cursor.executemany(query, *args, **kwargs)
+        finally:
+            self._invalidate(query)
+
+    def copy_expert(self, *args, **kwargs):
+        try:
+            return self._cursor.copy_expert(*args, **kwargs)
+        finally:
+            self._cache.clear()
+
+    def copy_from(self, *args, **kwargs):
+        try:
+            return self._cursor.copy_from(*args, **kwargs)
+        finally:
+            self._cache.clear()
+
+    def _invalidate(self, query):
+        if not (isinstance(query, str) and _is_readonly(query)):
+            self._cache.clear()
+
+
+_MISSING      = object()
+_cursor_names = itertools.count()
+
+
+def _row_count(cursor, result):
+    if isinstance(result, list):
+        return len(result)
+    if result is not None:
+        return 1
+    return max(cursor.rowcount, 0)
+
+
+def _opens_transaction(connection, fetch):
+    if not (fetch.server_side and isinstance(connection, psycopg2.extensions.connection)):
+        return False
+    if connection.autocommit:
+        return False
+    status = connection.get_transaction_status()
+    return status == psycopg2.extensions.TRANSACTION_STATUS_IDLE
+
+
+def _open_replica(connectable, params):
+    connection = connectable(**params)
+    if isinstance(connection, psycopg2.extensions.connection):
+        # reads should not hold a transaction open.
+        connection.autocommit = True
+    return connection
+
+
+def _is_readonly(query):
+    return bool(READONLY_QUERY.match(query)) and not WRITE_CLAUSE.search(query)
+
+
+def _split_hosts(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(",")
+    return [h.strip() for h in value if h.strip()]
+
+
+def _is_threaded_psycopg2(connection):
+    if not isinstance(connection, AsyncConnection):
+        return False
+    return isinstance(connection.raw, psycopg2.extensions.connection)
+
+
+def _paginate(iterable, size):
+    iterator = iter(iterable)
+    while page := list(itertools.islice(iterator, size)):
+        yield page
+
+
+def _executemany(cursor, query, page):
+    if isinstance(cursor, psycopg2.extensions.cursor):
+        psycopg2.extras.execute_batch(cursor, query, page, page_size=len(page))
+    else:
+        cursor.executemany(query, page)
+
+
+def _execute_values(cursor, query, page, template=None):
+    psycopg2.extras.execute_values(
+        cursor, query, page, template=template, page_size=len(page))
+
+
+def _copy_from(cursor, query, page):
+    buffer = io.StringIO()
+    for row in page:
+        buffer.write("\t".join([_copy_literal(v) for v in row]))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor.copy_expert(query, buffer)
+
+
+_COPY_ESCAPES = (
+    ("\\", "\\\\"), ("\t", "\\t"), ("\n", "\\n"), ("\r", "\\r"))
+
+
+def _copy_query(table, columns):
+    # "schema.table" names are quoted part by part.
+    Identifier = psycopg2.sql.Identifier
+    query = psycopg2.sql.SQL("COPY {}").format(Identifier(*table.split(".")))
+    if columns:
+        names = psycopg2.sql.SQL(", ").join([Identifier(c) for c in columns])
+        query += psycopg2.sql.SQL(" ({})").format(names)
+    return query + psycopg2.sql.SQL(" FROM STDIN")
+
+
+def _copy_literal(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        # bytea hex format, its backslash escaped.
+        return "\\\\x" + bytes(value).hex()
+    value = str(value)
+    for char, escaped in _COPY_ESCAPES:
+        value = value.replace(char, escaped)
+    return value
+
+
+class BasePoolMixIn(BaseClientMixIn):
+    pool_class        = ConnectionPool
+    pool_min_size     = 1
+    pool_max_size     = 10
+    pool_max_lifetime = 3600.0
+    pool_idle_timeout = 600.0
+    pool_timeout      = 30.0
+    pool_healthcheck  = HEALTHCHECK_QUERY
+
+    _pool: ConnectionPool
+
+    @property
+    def pool(self):
+        return self._pool
+
+    @property
+    def pool_stats(self) -> PoolStats:
+        return self._pool.stats()
+
+    def _init_pool(self):
+        factory = functools.partial(self.__class__.connectable, **self._connect_params)
+        return self.pool_class(
+            factory,
+            min_size=self.pool_min_size,
+            max_size=self.pool_max_size,
+            max_lifetime=self.pool_max_lifetime,
+            idle_timeout=self.pool_idle_timeout,
+            timeout=self.pool_timeout,
+            healthcheck=self.pool_healthcheck)
+
+
+class ClientPoolMixIn(ClientDatabaseMixIn, BasePoolMixIn):
+
+    def acquire(self, timeout: float = None):
+        """Check out a pooled connection as a context."""
+        if self._connect_state is ConnectState.CLOSED:
+            self._connect()
+        return self._pool.acquire(timeout)
+
+    def cursor(self, **kwargs) -> PooledCursor:
+        """
+        Open a cursor on a pooled connection, which
+        is returned to the pool once the cursor is
+        closed.
+        """
+        return super().cursor(**kwargs)
+
+    def commit(self):
+        """
+        Does nothing, unlike `DatabaseClient.commit`.
+        Each query, cursor or `acquire` block commits
+        as its connection is returned to the pool, so
+        there is never an open transaction to commit.
+        """
+        pass
+
+    def _connect(self) -> None:
+        self._connect_state = ConnectState.PENDING
+        try:
+            self._pool = self._init_pool()
+            self._pool.open()
+            self._connect_state = ConnectState.OPEN
+        except:
+            self._connect_state = ConnectState.CLOSED
+            raise
+
+    def _close(self) -> None:
+        try:
+            self._pool.close()
+        except:
+            raise
+        finally:
+            self._connect_state = ConnectState.CLOSED
+
+    def _cursor(self, **kwargs):
+        return self._pool.cursor(**kwargs)
+
+    def _checkout(self):
+        return self._pool.acquire()
+
 
 class BaseAsyncClientMixIn(ClientABCMixIn, BaseClientMixIn):
     pass
@@ -168,7 +801,7 @@ class AsyncClientHostsMixIn(BaseAsyncClientMixIn):
         self._connect_state = ConnectState.PENDING
         try:
             conn = self.__class__.connectable
-            self._connection    = conn(**self._connect_params)
+            self._connection    = await maybe_await(conn(**self._connect_params))
             self._connect_state = ConnectState.OPEN
         except:
             self._connect_state = ConnectState.CLOSED
@@ -176,12 +809,15 @@ class AsyncClientHostsMixIn(BaseAsyncClientMixIn):
 
     async def _close(self) -> None:
         try:
-            await self._connection.close()
+            await maybe_await(self._connection.close())
         except:
             raise
         finally:
             self._connect_state = ConnectState.CLOSED
 
+    async def _healthcheck(self) -> bool:
+        return self._connect_state is ConnectState.OPEN
+
 
 class AsyncClientContextMixIn(AsyncClientHostsMixIn, BaseClientMixIn):
 
@@ -192,3 +828,129 @@ class AsyncClientContextMixIn(AsyncClientHostsMixIn, BaseClientMixIn):
 
     async def __aexit__(self, type, value, traceback):
         await self._close()
+
+
+class AsyncClientDatabaseMixIn(AsyncClientHostsMixIn, BasePoolMixIn, ClientMetricsMixIn):
+    connectable = threaded(psycopg2.connect)
+    pool_class  = AsyncConnectionPool
+
+    _pool: AsyncConnectionPool
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float = None):
+        """Check out a pooled connection as a context."""
+        if self._connect_state is ConnectState.CLOSED:
+            await self._connect()
+        async with self._pool.acquire(timeout) as connection:
+            yield connection
+
+    async def execute(self, query: str, params: Union[Mapping[str, Any], Tuple], fetch=FetchMap.NONE):
+        """
+        Execute a query on a pooled connection.
+        Streaming fetch methods return an async
+        iterator over the results.
+        """
+        if self._connect_state is ConnectState.CLOSED:
+            return # need to define a not connected error
+        fetch = self._parse_fetch_method(fetch)
+        if isinstance(fetch, StreamFetch):
+            return self._stream(query, params, fetch)
+        return await self._execute(query, params, fetch)
+
+    def stream(self, query: str, params: Union[Mapping[str, Any], Tuple], fetch=FetchMap.ITER):
+        """Iterate over query results asynchronously."""
+        return self._stream(query, params, self._parse_fetch_method(fetch))
+
+    async def _connect(self) -> None:
+        self._connect_state = ConnectState.PENDING
+        try:
+            self._pool = self._init_pool()
+            await self._pool.open()
+            self._connect_state = ConnectState.OPEN
+        except:
+            self._connect_state = ConnectState.CLOSED
+            raise
+
+    async def _close(self) -> None:
+        try:
+            await self._pool.close()
+        except:
+            raise
+        finally:
+            self._connect_state = ConnectState.CLOSED
+
+    async def _execute(self, query, params, fetch):
+        start = time.perf_counter()
+        async with self._pool.acquire() as connection:
+            acquire = time.perf_counter() - start
+            cursor  = await connection.cursor()
+            try:
+                start    = time.perf_counter()
+                await cursor.execute(query, params)
+                executed = time.perf_counter()
+                result   = await maybe_await(fetch(cursor))
+                fetched  = time.perf_counter()
+                rows     = _row_count(cursor, result)
+            finally:
+                await cursor.close()
+
+        if self._tracking_queries():
+            await self._track_query(
+                query, params, acquire, executed - start, fetched - executed, rows)
+        return result
+
+    async def _track_query(self, query, params, acquire, execute, fetch, rows):
+        if self._record_query(query, acquire, execute, fetch, rows):
+            plan = await self._explain(query, params)
+            self._log_slow_query(query, acquire + execute + fetch, plan)
+
+    async def _explain(self, query, params):
+        # explained on a connection of its own, so a
+        # failure cannot touch the caller's transaction.
+        if not query.lstrip().lower().startswith(PREPARABLE):
+            return []
+        try:
+            async with self._pool.acquire() as connection:
+                if not _is_threaded_psycopg2(connection):
+                    return []
+                cursor = await connection.cursor()
+                try:
+                    await cursor.execute(f"EXPLAIN {query}", params)
+                    return [r[0] for r in await cursor.fetchall()]
+                finally:
+                    await cursor.close()
+        except Exception:
+            return []
+
+    async def _stream(self, query, params, fetch):
+        async with self._pool.acquire() as connection:
+            cursor = await self._stream_cursor(connection, fetch)
+            try:
+                await cursor.execute(query, params)
+                async for item in fetch.aiter(cursor):
+                    yield item
+            finally:
+                await cursor.close()
+
+    async def _stream_cursor(self, connection, fetch):
+        if fetch.server_side and _is_threaded_psycopg2(connection):
+            cursor = await connection.cursor(name=f"stream_{next(_cursor_names)}")
+            cursor.raw.itersize = fetch.size
+            return cursor
+        return await connection.cursor()
+
+    def _parse_fetch_method(self, method: Union[str, FetchMap]):
+        if isinstance(method, str):
+            return FetchMap[method.upper()]
+        return method
+
+    async def _healthcheck(self) -> bool:
+        if self._connect_state is not ConnectState.OPEN:
+            return False
+        async with self._pool.acquire() as connection:
+            cursor = await connection.cursor()
+            try:
+                await cursor.execute(HEALTHCHECK_QUERY)
+            finally:
+                await cursor.close()
+        return True
@@ -1,4 +1,5 @@
 import asyncio
+import threading
 
 from typing import Any, Callable, Coroutine, Mapping, Union
 
@@ -51,10 +52,15 @@ class Controller(ControllerInitMixIn, BaseController):
         self.set_listen_state("CLOSED")
 
     def refresh(self):
-        self.set_listen_state("REFRESH")
-        self.close()
-        self.connect()
-        self.set_listen_state("READY")
+        """
+        Rebuild `clients` in a background thread.
+        The new clients are swapped in once healthy,
+        while the retired clients are closed after
+        their in-flight handlers finish.
+        """
+        thread = threading.Thread(target=self._swap_clients, daemon=True)
+        thread.start()
+        return thread
 
     def listen(self):
         while not self.listen_state_is("CLOSED"):
@@ -89,12 +95,14 @@ class AsyncController(ControllerInitMixIn, AsyncBaseController):
         self.set_listen_state("CLOSED")
 
     async def refresh(self):
-        self.set_listen_state("REFRESH")
-        while not self.listen_state_is("REFRESH"):
-            await asyncio.sleep(1)
-        await self.postrun()
-        await self.prerun()
-        self.set_listen_state("READY")
+        """
+        Rebuild `clients` in a background task.
+        The new clients are swapped in once healthy,
+        while the retired clients are closed after
+        their in-flight handlers finish.
+        """
+        self._refresh_task = asyncio.ensure_future(self._swap_clients())
+        return self._refresh_task
 
     async def listen(self) -> None:
         while not self.listen_state_is("CLOSED"):
@@ -1,13 +1,18 @@
 import asyncio
+import contextvars
 import re
+import threading
 import time
 
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
 from logging import Logger
 from typing import Any, Mapping
 
 from consumerlib.controllers.maps import ListenState
-from consumerlib.helpers.maps import EventMap, ClientMap
+from consumerlib.helpers.limits import AdaptiveLimit
+from consumerlib.helpers.maps import EventMap, ClientMap, RateMap
 from consumerlib.helpers.queues import MessageQueue
 
 
@@ -15,10 +20,24 @@ class BaseControllerMixIn:
     clients_class  = ClientMap
     event_channels = EventMap
     queue_class    = MessageQueue
+    rate_limits    = RateMap
 
-    _clients: clients_class
-    _logger:  Logger
-    _queue:   queue_class
+    # guards against concurrent refreshes.
+    refresh_lock_class = threading.Lock
+
+    # set to dispatch handlers concurrently, bounded
+    # by a latency driven limit.
+    concurrency_class = None
+
+    # seconds to wait on in-flight handlers before
+    # closing clients retired by a refresh.
+    drain_timeout = 30.0
+
+    _clients:     clients_class
+    _concurrency: AdaptiveLimit
+    _logger:      Logger
+    _queue:       queue_class
+    _settings:    Mapping[str, Any]
 
     _listen_state = ListenState.CLOSED
 
@@ -28,7 +47,10 @@ class BaseControllerMixIn:
 
     @property
     def clients(self):
-        return self._clients
+        # handlers keep the clients they checked out
+        # even after a refresh swaps in new ones.
+        clients = self._checked_out.get()
+        return self._clients if clients is None else clients
 
     @property
     def listen_state(self):
@@ -44,6 +66,25 @@ class BaseControllerMixIn:
     def listen_state_is(self, state: str):
         return self._listen_state is ListenState[state]
 
+    @contextmanager
+    def _checkout_clients(self):
+        # the current clients are looked up and
+        # checked out together, so a refresh cannot
+        # retire them in between.
+        with ExitStack() as stack:
+            with self._clients_lock:
+                clients = stack.enter_context(self._clients.checkout())
+            token = self._checked_out.set(clients)
+            try:
+                yield clients
+            finally:
+                self._checked_out.reset(token)
+
+    def _replace_clients(self, clients):
+        with self._clients_lock:
+            retired, self._clients = self._clients, clients
+        return retired
+
 
 class ControllerInitMixIn(BaseControllerMixIn):
 
@@ -58,9 +99,16 @@ class ControllerInitMixIn(BaseControllerMixIn):
         return inst
 
     def _init(self, settings: Mapping[str, Any], logger: Logger, *args, **kwargs):
-        self._logger  = logger
-        self._clients = self._init_clients(settings)
-        self._queue   = self._init_queue(settings)
+        self._logger        = logger
+        self._settings      = settings
+        self._clients       = self._init_clients(settings)
+        self._queue         = self._init_queue(settings)
+        self._concurrency   = self._init_concurrency(settings)
+        self._executor      = None
+        self._handler_tasks = set()
+        self._clients_lock  = threading.Lock()
+        self._checked_out   = contextvars.ContextVar("checked_out", default=None)
+        self._refresh_lock  = self.refresh_lock_class()
         self.__init__(*args, **kwargs)
 
     def _init_clients(self, settings):
@@ -73,6 +121,15 @@ class ControllerInitMixIn(BaseControllerMixIn):
         inst.__init__(settings.get("QUEUE_MAX_SIZE", 2000))
         return inst
 
+    def _init_concurrency(self, settings):
+        if self.concurrency_class is None:
+            return None
+        inst = object.__new__(self.concurrency_class)
+        inst.__init__(
+            initial=settings.get("CONCURRENCY_INITIAL", 4),
+            maximum=settings.get("CONCURRENCY_MAX", 64))
+        return inst
+
 
 class ControllerABCMixIn(BaseControllerMixIn, ABC):
 
@@ -125,14 +182,51 @@ class ControllerHostsMixIn(ControllerABCMixIn, BaseControllerMixIn):
 
     def _refresh(self):
         try:
-            # may need to implement an event queue
-            # then wait for any remaining events to
-            # close out before running refresh.
             self.refresh()
         except Exception as failure:
             self._logger.error("failed refreshing host connections.")
             raise failure
 
+    def _swap_clients(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            self._logger.warning("refresh already in progress.")
+            return
+
+        try:
+            self._logger.info("refreshing host connections...")
+            try:
+                clients = self._build_clients()
+            except Exception:
+                self._logger.error("failed refreshing host connections:", exc_info=True)
+                return
+
+            retired = self._replace_clients(clients)
+            if retired.watching:
+                clients.watch_health()
+            self._logger.info("host connections refreshed.")
+            self._retire_clients(retired)
+        finally:
+            self._refresh_lock.release()
+
+    def _build_clients(self):
+        clients = self._init_clients(self._settings)
+        try:
+            clients.connect()
+            if not clients.healthy:
+                raise ConnectionError("replacement clients failed to open")
+        except:
+            clients.close()
+            raise
+        return clients
+
+    def _retire_clients(self, clients):
+        if not clients.drain(self.drain_timeout):
+            self._logger.warning("timed out draining in-flight handlers.")
+        try:
+            clients.close()
+        except Exception:
+            self._logger.error("failed closing retired host connections:", exc_info=True)
+
 
 class ControllerListenMixIn(ControllerABCMixIn, BaseControllerMixIn):
 
@@ -151,6 +245,7 @@ class ControllerListenMixIn(ControllerABCMixIn, BaseControllerMixIn):
 
     def _postrun(self, *args, **kwargs):
         self._logger.info("stopping consumer...")
+        self._stop_handlers()
         self.postrun()
         self._logger.info("consumer no longer in ready state.")
 
@@ -160,7 +255,8 @@ class ControllerQueueWatchMixIn(ControllerABCMixIn, BaseControllerMixIn):
     def handle_event(self, event, message):
         """
         Not implemented here.
-        handle an incoming event.
+        handle an incoming event. Exceptions are
+        logged and the message is dropped.
         """
         pass
 
@@ -183,7 +279,45 @@ class ControllerQueueWatchMixIn(ControllerABCMixIn, BaseControllerMixIn):
                 return
 
             self.logger.info(f"received message: {message!r}")
-            self.handle_event(event, message)
+            self._throttle_event(message)
+            self._dispatch_event(event, message)
+
+    def _throttle_event(self, message):
+        name = _event_name(message)
+        if name in self.rate_limits:
+            self.rate_limits[name].acquire()
+
+    def _dispatch_event(self, event, message):
+        if self._concurrency is None:
+            self._handle_event(event, message)
+            return
+
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self._concurrency.maximum)
+        self._concurrency.acquire()
+        self._executor.submit(self._handle_limited_event, event, message)
+
+    def _handle_limited_event(self, event, message):
+        failed, start = True, time.monotonic()
+        try:
+            failed = not self._handle_event(event, message)
+        finally:
+            self._concurrency.release(time.monotonic() - start, failed)
+
+    def _handle_event(self, event, message):
+        try:
+            with self._checkout_clients():
+                self.handle_event(event, message)
+        except Exception:
+            self._logger.error("failed handling event:", exc_info=True)
+            return False
+        return True
+
+    def _stop_handlers(self):
+        # waits for in-flight handlers to finish.
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     def _get_next_message(self):
         message = self.queue.pull()
@@ -192,8 +326,7 @@ class ControllerQueueWatchMixIn(ControllerABCMixIn, BaseControllerMixIn):
         return (None, None)
 
     def _parse_message(self, message):
-        event = re.split(r"^/\w+/", message["channel"])[-1]
-        return self.event_channels[event], message
+        return self.event_channels[_event_name(message)], message
 
 
 class BaseAsyncControllerMixIn(ControllerABCMixIn, BaseControllerMixIn):
@@ -201,6 +334,7 @@ class BaseAsyncControllerMixIn(ControllerABCMixIn, BaseControllerMixIn):
 
 
 class AsyncControllerHostsMixIn(BaseAsyncControllerMixIn):
+    refresh_lock_class = asyncio.Lock
 
     async def _connect(self, *args, **kwargs):
         self._logger.info("connecting to hosts...")
@@ -220,14 +354,49 @@ class AsyncControllerHostsMixIn(BaseAsyncControllerMixIn):
 
     async def _refresh(self):
         try:
-            # may need to implement an event queue
-            # then wait for any remaining events to
-            # close out before running refresh.
             await self.refresh()
         except Exception as failure:
             self._logger.error("failed refreshing host connections.")
             raise failure
 
+    async def _swap_clients(self):
+        if self._refresh_lock.locked():
+            self._logger.warning("refresh already in progress.")
+            return
+
+        async with self._refresh_lock:
+            self._logger.info("refreshing host connections...")
+            try:
+                clients = await self._build_clients()
+            except Exception:
+                self._logger.error("failed refreshing host connections:", exc_info=True)
+                return
+
+            retired = self._replace_clients(clients)
+            if retired.watching:
+                clients.awatch_health()
+            self._logger.info("host connections refreshed.")
+            await self._retire_clients(retired)
+
+    async def _build_clients(self):
+        clients = self._init_clients(self._settings)
+        try:
+            await clients.aconnect()
+            if not clients.healthy:
+                raise ConnectionError("replacement clients failed to open")
+        except:
+            await clients.aclose()
+            raise
+        return clients
+
+    async def _retire_clients(self, clients):
+        if not await clients.adrain(self.drain_timeout):
+            self._logger.warning("timed out draining in-flight handlers.")
+        try:
+            await clients.aclose()
+        except Exception:
+            self._logger.error("failed closing retired host connections:", exc_info=True)
+
 
 class AsyncControllerListenMixIn(BaseAsyncControllerMixIn):
 
@@ -246,6 +415,7 @@ class AsyncControllerListenMixIn(BaseAsyncControllerMixIn):
 
     async def _postrun(self, *args, **kwargs):
         self._logger.info("stopping consumer...")
+        await self._stop_handlers()
         await self.postrun()
         self._logger.info("consumer no longer in ready state.")
 
@@ -255,7 +425,8 @@ class AsyncControllerQueueWatchMixIn(BaseAsyncControllerMixIn):
     async def handle_event(self, event, message):
         """
         Not implemented here.
-        handle an incoming event.
+        handle an incoming event. Exceptions are
+        logged and the message is dropped.
         """
         pass
 
@@ -278,7 +449,46 @@ class AsyncControllerQueueWatchMixIn(BaseAsyncControllerMixIn):
             if message is None:
                 return
 
-            await self.handle_event(event, message)
+            await self._throttle_event(message)
+            await self._dispatch_event(event, message)
+
+    async def _throttle_event(self, message):
+        name = _event_name(message)
+        if name in self.rate_limits:
+            await self.rate_limits[name].aacquire()
+
+    async def _dispatch_event(self, event, message):
+        if self._concurrency is None:
+            await self._handle_event(event, message)
+            return
+
+        while not self._concurrency.try_acquire():
+            await asyncio.wait(self._handler_tasks, return_when=asyncio.FIRST_COMPLETED)
+
+        task = asyncio.ensure_future(self._handle_limited_event(event, message))
+        self._handler_tasks.add(task)
+        task.add_done_callback(self._handler_tasks.discard)
+
+    async def _handle_limited_event(self, event, message):
+        failed, start = True, time.monotonic()
+        try:
+            failed = not await self._handle_event(event, message)
+        finally:
+            self._concurrency.release(time.monotonic() - start, failed)
+
+    async def _handle_event(self, event, message):
+        try:
+            with self._checkout_clients():
+                await self.handle_event(event, message)
+        except Exception:
+            self._logger.error("failed handling event:", exc_info=True)
+            return False
+        return True
+
+    async def _stop_handlers(self):
+        # waits for in-flight handlers to finish.
+        if self._handler_tasks:
+            await asyncio.gather(*self._handler_tasks, return_exceptions=True)
 
     async def _get_next_message(self):
         message = self.queue.pull()
@@ -287,5 +497,8 @@ class AsyncControllerQueueWatchMixIn(BaseAsyncControllerMixIn):
         return (None, None)
 
     async def _parse_message(self, message):
-        event = re.split(r"^/\w+/", message["channel"])[-1]
-        return self.event_channels[event], message
+        return self.event_channels[_event_name(message)], message
+
+
+def _event_name(message):
+    return re.split(r"^/\w+/", message["channel"])[-1]
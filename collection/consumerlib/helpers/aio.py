@@ -0,0 +1,119 @@
+import asyncio
+import functools
+import inspect
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+
+async def maybe_await(value):
+    """Await `value` if it is awaitable."""
+    if inspect.isawaitable(value):
+        return await value
+    return value
+
+
+def threaded(connectable: Callable[..., Any]):
+    """
+    Wrap a blocking DB-API `connect` function so
+    it returns an `AsyncConnection` when awaited.
+    """
+
+    @functools.wraps(connectable)
+    async def connect(*args, **kwargs):
+        loop     = asyncio.get_running_loop()
+        executor = ThreadPoolExecutor(1)
+        try:
+            func       = functools.partial(connectable, *args, **kwargs)
+            connection = await loop.run_in_executor(executor, func)
+        except:
+            executor.shutdown(wait=False)
+            raise
+        return AsyncConnection(connection, executor)
+
+    return connect
+
+
+class AsyncConnection:
+    """
+    Blocking DB-API connection driven from its own
+    worker thread, exposing awaitable methods in
+    the style of `aiosqlite`.
+    """
+
+    def __init__(self, connection, executor: ThreadPoolExecutor):
+        self._connection = connection
+        self._executor   = executor
+
+    @property
+    def raw(self):
+        return self._connection
+
+    async def cursor(self, *args, **kwargs):
+        cursor = await self._run(self._connection.cursor, *args, **kwargs)
+        return AsyncCursor(self, cursor)
+
+    async def commit(self):
+        await self._run(self._connection.commit)
+
+    async def rollback(self):
+        await self._run(self._connection.rollback)
+
+    async def close(self):
+        try:
+            await self._run(self._connection.close)
+        finally:
+            self._executor.shutdown(wait=False)
+
+    async def _run(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        func = functools.partial(func, *args, **kwargs)
+        return await loop.run_in_executor(self._executor, func)
+
+
+class AsyncCursor:
+    """Awaitable wrapper of a DB-API cursor."""
+
+    def __init__(self, connection: AsyncConnection, cursor):
+        self._connection = connection
+        self._cursor     = cursor
+
+    @property
+    def raw(self):
+        return self._cursor
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    async def execute(self, query, params=None):
+        args = (query,) if params is None else (query, params)
+        await self._connection._run(self._cursor.execute, *args)
+        return self
+
+    async def executemany(self, query, params_seq):
+        await self._connection._run(self._cursor.executemany, query, params_seq)
+        return self
+
+    async def fetchone(self):
+        return await self._connection._run(self._cursor.fetchone)
+
+    async def fetchmany(self, size: int = None):
+        size = self._cursor.arraysize if size is None else size
+        return await self._connection._run(self._cursor.fetchmany, size)
+
+    async def fetchall(self):
+        return await self._connection._run(self._cursor.fetchall)
+
+    async def close(self):
+        await self._connection._run(self._cursor.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, etype, evalue, traceback):
+        await self.close()
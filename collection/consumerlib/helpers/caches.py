@@ -0,0 +1,45 @@
+import threading
+import time
+
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class ResultCache:
+    """
+    Thread safe LRU of query results, each kept
+    for its own time to live.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self.hits     = 0
+        self.misses   = 0
+
+        self._entries = OrderedDict()
+        self._lock    = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
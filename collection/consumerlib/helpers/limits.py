@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+
+class RateLimit:
+    """
+    Token bucket limiting how often an event
+    channel may be handled.
+    """
+
+    def __init__(self, rate: float, burst: float = None):
+        self.rate  = float(rate)
+        self.burst = float(burst or max(1.0, rate))
+
+        self._tokens = self.burst
+        self._stamp  = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def reserve(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, returning the
+        seconds to wait before they are available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp  = now
+
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire(self, tokens: float = 1):
+        """Block until tokens are available."""
+        delay = self.reserve(tokens)
+        if delay:
+            time.sleep(delay)
+
+    async def aacquire(self, tokens: float = 1):
+        """Async counterpart of `acquire`."""
+        delay = self.reserve(tokens)
+        if delay:
+            await asyncio.sleep(delay)
+
+
+class AdaptiveLimit:
+    """
+    Concurrency limit driven by handler latency.
+    The limit grows additively while latency stays
+    near its observed baseline and is cut
+    multiplicatively once latency rises past
+    `tolerance` times that baseline, or a handler
+    fails.
+    """
+
+    def __init__(
+        self, initial: int = 4, minimum: int = 1, maximum: int = 64,
+        tolerance: float = 2.0, backoff: float = 0.75, smoothing: float = 0.2):
+        self.minimum   = minimum
+        self.maximum   = maximum
+        self.tolerance = tolerance
+        self.backoff   = backoff
+        self.smoothing = smoothing
+
+        self._limit    = float(max(minimum, min(initial, maximum)))
+        self._inflight = 0
+        self._baseline = None
+        self._latency  = None
+        self._cond     = threading.Condition()
+
+    @property
+    def limit(self):
+        return int(self._limit)
+
+    @property
+    def inflight(self):
+        return self._inflight
+
+    def try_acquire(self) -> bool:
+        """Take a slot if one is free."""
+        with self._cond:
+            return self._take()
+
+    def acquire(self, timeout: float = None) -> bool:
+        """
+        Block until a slot is free. Returns `False`
+        if the timeout expired first.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._inflight < self.limit, timeout):
+                return False
+            return self._take()
+
+    def release(self, latency: float, failed: bool = False):
+        """Return a slot, recording its latency."""
+        with self._cond:
+            saturated = self._inflight >= self.limit
+            self._inflight -= 1
+            self._update(latency, failed, saturated)
+            self._cond.notify_all()
+
+    def _take(self):
+        if self._inflight >= self.limit:
+            return False
+        self._inflight += 1
+        return True
+
+    def _update(self, latency, failed, saturated):
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += (latency - self._latency) * self.smoothing
+
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # let the baseline drift so a lasting
+            # shift in latency is eventually accepted.
+            self._baseline += (latency - self._baseline) * 0.01
+
+        if failed or self._latency > self._baseline * self.tolerance:
+            self._limit   = max(self.minimum, self._limit * self.backoff)
+            self._latency = None
+        elif saturated:
+            self._limit = min(self.maximum, self._limit + 1 / self._limit)
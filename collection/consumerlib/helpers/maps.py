@@ -1,8 +1,18 @@
+import asyncio
+import logging
+import threading
+import time
+
 from abc import ABC, ABCMeta, abstractmethod
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from dataclasses import dataclass, field as dc_field
 from logging import Logger
-from typing import Any, Callable, Coroutine, List, Mapping, Tuple, Union
+from typing import Any, Callable, Coroutine, Dict, List, Mapping, Tuple, Union
 
+from consumerlib.helpers.limits import RateLimit
+from consumerlib.helpers.retry import ReconnectPolicy
 from consumerlib.helpers.typedefs import ClientType
 
 
@@ -85,13 +95,272 @@ class ParamMapMeta(NoDundersMapMeta):
         return super().__getitem__(name)
 
 
+class RateMapMeta(NoDundersMapMeta):
+
+    def items(cls) -> List[Tuple[str, RateLimit]]:
+        return super().items()
+
+    def __getitem__(cls, name) -> RateLimit:
+        return super().__getitem__(name)
+
+
 class BaseClientMap(ABC):
     _client_member_classes = {}
     _settings              = {}
 
+    # seconds each member is given to connect, close
+    # or answer a health check, `None` waits forever.
+    client_timeout       = None
+    healthcheck_interval = 30.0
+    reconnect_policy     = ReconnectPolicy()
+
+    # seconds a member replaced by a reconnect is
+    # left to in-flight handlers before closing.
+    retire_timeout = 30.0
+
+    _inflight      = 0
+    _inflight_by:   Counter
+    _inflight_cond: threading.Condition
+    _logger:        Logger
+
+    @property
+    def healthy(self):
+        if self._unhealthy:
+            return False
+        return all([_connect_state_is(c, "OPEN") for c in self])
+
+    @property
+    def inflight(self):
+        return self._inflight
+
+    @property
+    def unhealthy(self):
+        return frozenset(self._unhealthy)
+
+    @property
+    def watching(self):
+        return self._health_watch is not None
+
     def keys(self):
         return [k for k in self._client_member_classes.keys()]
 
+    def connect(self, timeout: float = None):
+        """
+        Connect all client members in parallel.
+        Every member is given the chance to connect
+        before the last failure, if any, is raised.
+        """
+        self._health_stop.clear()
+        _raise_failures(self._run_parallel("connect", self.keys(), timeout))
+
+    def close(self, timeout: float = None):
+        """
+        Close all open client members in parallel.
+        Every member is given the chance to close
+        before the last failure, if any, is raised.
+        """
+        self.unwatch_health()
+        _raise_failures(self._run_parallel("close", self._open_clients(), timeout))
+
+    async def aconnect(self, timeout: float = None):
+        """
+        Connect all client members concurrently from
+        within an event loop. Blocking clients are
+        connected in the loop's default executor.
+        """
+        self._health_stop.clear()
+        _raise_failures(await self._gather("connect", self.keys(), timeout))
+
+    async def aclose(self, timeout: float = None):
+        """Async counterpart of `close`."""
+        self.unwatch_health()
+        _raise_failures(await self._gather("close", self._open_clients(), timeout))
+
+    def check_health(self, timeout: float = None) -> List[str]:
+        """
+        Health check open members, marking those that
+        fail and reconnecting them in the background.
+        Returns the names of unhealthy members.
+        """
+        results = self._run_parallel("healthcheck", self._open_clients(), timeout)
+        for name in self._mark_health(results):
+            threading.Thread(target=self._reconnect, args=(name,), daemon=True).start()
+        return sorted(self._unhealthy)
+
+    async def acheck_health(self, timeout: float = None) -> List[str]:
+        """Async counterpart of `check_health`."""
+        results = await self._gather("healthcheck", self._open_clients(), timeout)
+        for name in self._mark_health(results):
+            self._reconnects.add(asyncio.ensure_future(self._areconnect(name)))
+        return sorted(self._unhealthy)
+
+    def watch_health(self, interval: float = None) -> threading.Thread:
+        """Run `check_health` every `interval` seconds in a background thread."""
+        interval = interval or self.healthcheck_interval
+        self._health_stop.clear()
+
+        def watch():
+            while not self._health_stop.wait(interval):
+                self.check_health()
+
+        self._health_watch = threading.Thread(target=watch, daemon=True)
+        self._health_watch.start()
+        return self._health_watch
+
+    def awatch_health(self, interval: float = None) -> asyncio.Task:
+        """Run `acheck_health` every `interval` seconds in a background task."""
+        interval = interval or self.healthcheck_interval
+        self._health_stop.clear()
+
+        async def watch():
+            while not self._health_stop.is_set():
+                await asyncio.sleep(interval)
+                await self.acheck_health()
+
+        self._health_watch = asyncio.ensure_future(watch())
+        return self._health_watch
+
+    def unwatch_health(self):
+        """Stop background health checks and reconnects."""
+        self._health_stop.set()
+        if isinstance(self._health_watch, asyncio.Future):
+            self._health_watch.cancel()
+        for task in self._reconnects:
+            task.cancel()
+        self._health_watch = None
+
+    @contextmanager
+    def checkout(self):
+        """
+        Mark a handler as in-flight against this
+        mapping for the duration of the context.
+        """
+        with self._inflight_cond:
+            self._inflight += 1
+            clients = [id(c) for c in self]
+            self._inflight_by.update(clients)
+        try:
+            yield self
+        finally:
+            with self._inflight_cond:
+                self._inflight -= 1
+                self._inflight_by -= Counter(clients)
+                self._inflight_cond.notify_all()
+
+    def drain(self, timeout: float = None, client: ClientType = None) -> bool:
+        """
+        Wait for in-flight handlers to finish, or
+        only those that checked out `client`.
+        Returns `False` if the timeout expired first.
+        """
+        with self._inflight_cond:
+            return self._inflight_cond.wait_for(lambda: not self._inflight_of(client), timeout)
+
+    async def adrain(
+        self, timeout: float = None, interval: float = 0.1, client: ClientType = None) -> bool:
+        """Async counterpart of `drain`."""
+        loop     = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while self._inflight_of(client) > 0:
+            if deadline is not None and loop.time() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+        return True
+
+    def _inflight_of(self, client):
+        if client is None:
+            return self._inflight
+        return self._inflight_by[id(client)]
+
+    def _open_clients(self):
+        return [n for n in self.keys() if not _connect_state_is(self[n], "CLOSED")]
+
+    def _run_parallel(self, method, names, timeout):
+        if not names:
+            return {}
+        timeout  = timeout or self.client_timeout
+        executor = ThreadPoolExecutor(len(names))
+        futures  = {n: executor.submit(getattr(self[n], method)) for n in names}
+        executor.shutdown(wait=False)
+
+        results, deadline = {}, None if timeout is None else time.monotonic() + timeout
+        for name, future in futures.items():
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            try:
+                results[name] = future.result(remaining)
+            except FutureTimeoutError:
+                results[name] = _timed_out(name, method, timeout)
+            except Exception as error:
+                results[name] = error
+        return results
+
+    async def _gather(self, method, names, timeout):
+        timeout = timeout or self.client_timeout
+        calls   = [_run_client_method(getattr(self[n], method)) for n in names]
+        results = await asyncio.gather(
+            *[asyncio.wait_for(c, timeout) for c in calls], return_exceptions=True)
+
+        results = list(results)
+        for index, result in enumerate(results):
+            if isinstance(result, asyncio.TimeoutError):
+                results[index] = _timed_out(names[index], method, timeout)
+        return dict(zip(names, results))
+
+    def _mark_health(self, results):
+        failed = []
+        with self._health_lock:
+            for name, result in results.items():
+                if result is True or name in self._reconnecting:
+                    continue
+                self._logger.warning(f"client {name!r} failed health check.")
+                self._unhealthy.add(name)
+                self._reconnecting.add(name)
+                failed.append(name)
+        return failed
+
+    def _reconnect(self, name):
+        # a fresh client is swapped in, as handlers
+        # may still be using the failed one.
+        try:
+            for delay in self.reconnect_policy.delays():
+                if self._health_stop.wait(delay):
+                    return
+                client = _open_client(self.new_client(name, self._logger), self._logger, name)
+                if client is not None:
+                    retired = self._mark_reconnected(name, client)
+                    self.drain(self.retire_timeout, retired)
+                    _close_client(retired)
+                    return
+            self._logger.error(f"gave up reconnecting client {name!r}.")
+        finally:
+            with self._health_lock:
+                self._reconnecting.discard(name)
+
+    async def _areconnect(self, name):
+        try:
+            for delay in self.reconnect_policy.delays():
+                await asyncio.sleep(delay)
+                client = await _aopen_client(self.new_client(name, self._logger), self._logger, name)
+                if client is not None:
+                    retired = self._mark_reconnected(name, client)
+                    await self.adrain(self.retire_timeout, client=retired)
+                    await _aclose_client(retired)
+                    return
+            self._logger.error(f"gave up reconnecting client {name!r}.")
+        finally:
+            self._reconnecting.discard(name)
+            self._reconnects.discard(asyncio.current_task())
+
+    def _mark_reconnected(self, name, client):
+        self._logger.info(f"client {name!r} reconnected.")
+        # swapped under the in-flight lock, so every
+        # checkout counts against one client or the other.
+        with self._health_lock, self._inflight_cond:
+            retired = self[name]
+            setattr(self, name, client)
+            self._unhealthy.discard(name)
+        return retired
+
     def new_client(self, name, logger=None) -> ClientType:
         """
         Create a new client instance if the class
@@ -107,11 +376,11 @@ class BaseClientMap(ABC):
             setattr(self, name, client)
 
     def _set_client_member_classes(self):
-        for name in dir(self):
+        for name in dir(self.__class__):
             if "__" in name[:2]:
                 continue
 
-            value = getattr(self, name)
+            value = getattr(self.__class__, name)
             if type(value) is not ClientType:
                 continue
             self._client_member_classes[name] = value
@@ -123,7 +392,16 @@ class BaseClientMap(ABC):
         return True
 
     def __init__(self, settings: Mapping[str, Any], logger: Logger = None):
-        self._settings = settings
+        self._settings      = settings
+        self._logger        = logger or logging.getLogger(__name__)
+        self._inflight_by   = Counter()
+        self._inflight_cond = threading.Condition()
+        self._health_lock   = threading.Lock()
+        self._health_stop   = threading.Event()
+        self._health_watch  = None
+        self._unhealthy     = set()
+        self._reconnecting  = set()
+        self._reconnects    = set()
         self._set_client_member_classes()
         self._set_client_members(logger)
 
@@ -138,6 +416,67 @@ class BaseClientMap(ABC):
         return iter([self[c] for c in self.keys()])
 
 
+def _connect_state_is(client, state: str):
+    return client.connect_state.name == state
+
+
+def _raise_failures(results: Dict[str, Any]):
+    failures = [r for r in results.values() if isinstance(r, BaseException)]
+    if failures:
+        raise failures[-1]
+
+
+def _timed_out(name, method, timeout):
+    return TimeoutError(f"client {name!r} did not {method} within {timeout}s")
+
+
+def _open_client(client, logger, name):
+    try:
+        client.connect()
+        if client.healthcheck() is True:
+            return client
+    except Exception:
+        pass
+    logger.warning(f"failed reconnecting client {name!r}.")
+    _close_client(client)
+    return None
+
+
+async def _aopen_client(client, logger, name):
+    try:
+        await _run_client_method(client.connect)
+        if await _run_client_method(client.healthcheck) is True:
+            return client
+    except Exception:
+        pass
+    logger.warning(f"failed reconnecting client {name!r}.")
+    await _aclose_client(client)
+    return None
+
+
+def _close_client(client):
+    try:
+        if not _connect_state_is(client, "CLOSED"):
+            client.close()
+    except Exception:
+        pass
+
+
+async def _aclose_client(client):
+    try:
+        if not _connect_state_is(client, "CLOSED"):
+            await _run_client_method(client.close)
+    except Exception:
+        pass
+
+
+async def _run_client_method(method):
+    if asyncio.iscoroutinefunction(method):
+        return await method()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, method)
+
+
 class BaseFetchMap(Callable[..., Any], metaclass=FetchMapMeta):
 
     def __init__(self, func: Callable[..., Any]):
@@ -147,6 +486,42 @@ class BaseFetchMap(Callable[..., Any], metaclass=FetchMapMeta):
         return self.func(*args, **kwargs)
 
 
+class StreamFetch:
+    """
+    Fetch method yielding rows lazily from a cursor
+    held open for the life of the iterator. Rows
+    are pulled from the host `size` at a time and
+    yielded one by one, or as lists if `batches`.
+    Calling it with a size gives the same fetch
+    method pulling `size` rows at a time.
+    """
+
+    def __init__(self, size: int = 2000, batches: bool = False, server_side: bool = True):
+        self.size        = size
+        self.batches     = batches
+        self.server_side = server_side
+
+    def __call__(self, size: int) -> "StreamFetch":
+        return StreamFetch(size, self.batches, self.server_side)
+
+    def iter(self, cursor):
+        """Iterate the rows of `cursor`."""
+        while rows := cursor.fetchmany(self.size):
+            if self.batches:
+                yield rows
+            else:
+                yield from rows
+
+    async def aiter(self, cursor):
+        """Async counterpart of calling the fetch."""
+        while rows := await cursor.fetchmany(self.size):
+            if self.batches:
+                yield rows
+            else:
+                for row in rows:
+                    yield row
+
+
 class ClientMap(BaseClientMap):
     """Client name to host relationship mapping."""
     pass
@@ -162,8 +537,15 @@ class FetchMap(BaseFetchMap):
     NONE = lambda curs: None
     ONE  = lambda curs: curs.fetchone()
     ALL  = lambda curs: curs.fetchall()
+    ITER = StreamFetch()
+    MANY = StreamFetch(batches=True)
 
 
 class ParamMap(metaclass=ParamMapMeta):
     """Config to parameter relationship mapping."""
     pass
+
+
+class RateMap(metaclass=RateMapMeta):
+    """Event to rate limit relationship mapping."""
+    pass
@@ -0,0 +1,85 @@
+import functools
+import re
+import threading
+
+from dataclasses import dataclass, replace
+from typing import List
+
+
+COMMENTS     = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+STRINGS      = re.compile(r"'(?:[^']|'')*'")
+NUMBERS      = re.compile(r"(?<![\w$])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+PLACEHOLDERS = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+VALUE_LISTS  = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+WHITESPACE   = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(query: str) -> str:
+    """
+    Normalize a query so calls differing only in
+    literal values share the same fingerprint.
+    """
+    query = COMMENTS.sub(" ", query)
+    query = STRINGS.sub("?", query)
+    query = NUMBERS.sub("?", query)
+    query = PLACEHOLDERS.sub("?", query)
+    query = VALUE_LISTS.sub("(?)", query)
+    return WHITESPACE.sub(" ", query).strip().lower()
+
+
+@dataclass
+class QueryStats:
+    fingerprint:  str
+    calls:        int   = 0
+    rows:         int   = 0
+    slow:         int   = 0
+    acquire_time: float = 0.0
+    execute_time: float = 0.0
+    fetch_time:   float = 0.0
+    max_time:     float = 0.0
+
+    @property
+    def total_time(self):
+        return self.acquire_time + self.execute_time + self.fetch_time
+
+    @property
+    def mean_time(self):
+        if not self.calls:
+            return 0.0
+        return self.total_time / self.calls
+
+
+class QueryMetrics:
+    """Thread safe query timings aggregated by fingerprint."""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock  = threading.Lock()
+
+    def record(
+        self, query: str, acquire: float, execute: float, fetch: float,
+        rows: int, slow: bool = False) -> QueryStats:
+        key = fingerprint(query)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = QueryStats(key)
+            stats.calls        += 1
+            stats.rows         += rows
+            stats.slow         += int(slow)
+            stats.acquire_time += acquire
+            stats.execute_time += execute
+            stats.fetch_time   += fetch
+            stats.max_time      = max(stats.max_time, acquire + execute + fetch)
+            return stats
+
+    def snapshot(self) -> List[QueryStats]:
+        """Copy of the aggregates, most total time first."""
+        with self._lock:
+            stats = [replace(s) for s in self._stats.values()]
+        return sorted(stats, key=lambda s: s.total_time, reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
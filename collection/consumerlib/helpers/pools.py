@@ -0,0 +1,504 @@
+import asyncio
+import threading
+import time
+
+from collections import deque
+from contextlib import asynccontextmanager, closing, contextmanager
+from dataclasses import dataclass, field as dc_field
+from typing import Any, Callable
+
+from consumerlib.helpers.aio import maybe_await
+
+
+@dataclass
+class PoolStats:
+    size:       int
+    idle:       int
+    in_use:     int
+    acquired:   int   = 0
+    waited:     int   = 0
+    timeouts:   int   = 0
+    wait_total: float = 0.0
+    wait_max:   float = 0.0
+
+    @property
+    def wait_mean(self):
+        if not self.acquired:
+            return 0.0
+        return self.wait_total / self.acquired
+
+
+@dataclass
+class PoolEntry:
+    connection: Any
+    created:    float = dc_field(default_factory=time.monotonic)
+    last_used:  float = dc_field(default_factory=time.monotonic)
+
+
+class BasePool:
+    """
+    Connections are created by `factory` on demand,
+    up to `max_size`, and retired once older than
+    `max_lifetime` or idle longer than
+    `idle_timeout` while above `min_size`.
+    """
+
+    def __init__(
+        self, factory: Callable[[], Any], min_size: int = 1, max_size: int = 10,
+        max_lifetime: float = 3600.0, idle_timeout: float = 600.0,
+        timeout: float = 30.0, healthcheck: str = "SELECT 1",
+        healthcheck_after: float = 5.0):
+        self.factory           = factory
+        self.min_size          = min_size
+        self.max_size          = max_size
+        self.max_lifetime      = max_lifetime
+        self.idle_timeout      = idle_timeout
+        self.timeout           = timeout
+        self.healthcheck       = healthcheck
+        self.healthcheck_after = healthcheck_after
+
+        self._idle    = deque()
+        self._in_use  = {}
+        self._size    = 0
+        self._closed  = False
+        self._metrics = PoolStats(0, 0, 0)
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def stats(self) -> PoolStats:
+        """Snapshot of pool usage and wait times."""
+        metrics = PoolStats(**self._metrics.__dict__)
+        metrics.size   = self._size
+        metrics.idle   = len(self._idle)
+        metrics.in_use = len(self._in_use)
+        return metrics
+
+    def _is_expired(self, entry, now):
+        if self.max_lifetime and now - entry.created > self.max_lifetime:
+            return True
+        if self._size <= self.min_size:
+            return False
+        return bool(self.idle_timeout) and now - entry.last_used > self.idle_timeout
+
+    def _needs_healthcheck(self, entry):
+        if not self.healthcheck:
+            return False
+        return time.monotonic() - entry.last_used >= self.healthcheck_after
+
+    def _record_wait(self, elapsed, waited):
+        self._metrics.acquired   += 1
+        self._metrics.waited     += int(waited)
+        self._metrics.wait_total += elapsed
+        self._metrics.wait_max    = max(self._metrics.wait_max, elapsed)
+
+    def _pop_idle(self, now, retired):
+        self._reap(now, retired)
+        return self._idle.pop() if self._idle else None
+
+    def _reap(self, now, retired):
+        # sweep the whole deque, oldest first, as reuse
+        # only ever takes from the newest end.
+        idle = deque()
+        for entry in self._idle:
+            if self._is_expired(entry, now):
+                self._size -= 1
+                retired.append(entry)
+            else:
+                idle.append(entry)
+        self._idle = idle
+
+    def _timed_out(self, timeout):
+        self._metrics.timeouts += 1
+        return TimeoutError(f"timed out after {timeout}s waiting for a connection")
+
+
+class ConnectionPool(BasePool):
+    """Thread safe pool of DB-API connections."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = threading.Condition()
+
+    def open(self):
+        """
+        Fill the pool up to `min_size`. If any
+        connection fails, those already made are
+        closed before the error is raised.
+        """
+        self._closed, created = False, []
+        try:
+            for _ in range(self.min_size - self._size):
+                created.append(self._create())
+        except:
+            for entry in created:
+                self._discard(entry)
+            raise
+
+        with self._cond:
+            self._idle.extend(created)
+            self._cond.notify_all()
+
+    def close(self):
+        """
+        Close idle connections. Connections still in
+        use are closed as they are returned.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for entry in idle:
+            _close_quietly(entry.connection)
+
+    @contextmanager
+    def acquire(self, timeout: float = None):
+        """
+        Check out a connection for the duration of
+        the context. The transaction is committed on
+        a clean exit and rolled back otherwise.
+        """
+        connection = self.get(timeout)
+        try:
+            yield connection
+        except:
+            self.put(connection, rollback=True)
+            raise
+        else:
+            self.put(connection, commit=True)
+
+    def cursor(self, timeout: float = None, **kwargs) -> "PooledCursor":
+        """
+        Check out a connection and open a cursor on
+        it. The connection is returned to the pool
+        once the cursor is closed.
+        """
+        connection = self.get(timeout)
+        try:
+            cursor = connection.cursor(**kwargs)
+        except:
+            self.put(connection, rollback=True)
+            raise
+        return PooledCursor(self, connection, cursor)
+
+    def get(self, timeout: float = None):
+        """Check out a connection from the pool."""
+        timeout = self.timeout if timeout is None else timeout
+        start   = time.monotonic()
+
+        while True:
+            entry, waited = self._checkout(start, timeout)
+            if entry is None:
+                entry = self._create(reserved=True)
+            elif not self._is_healthy(entry):
+                self._discard(entry)
+                continue
+            break
+
+        with self._cond:
+            self._in_use[id(entry.connection)] = entry
+            self._record_wait(time.monotonic() - start, waited)
+        return entry.connection
+
+    def put(self, connection, commit: bool = False, rollback: bool = False):
+        """Return a connection to the pool."""
+        with self._cond:
+            entry = self._in_use.pop(id(connection))
+
+        try:
+            if commit:
+                connection.commit()
+            elif rollback:
+                connection.rollback()
+        except Exception:
+            self._discard(entry)
+            if commit:
+                raise
+            return
+
+        entry.last_used = time.monotonic()
+        if self._closed:
+            self._discard(entry)
+            return
+
+        retired = []
+        with self._cond:
+            self._idle.append(entry)
+            self._reap(entry.last_used, retired)
+            self._cond.notify()
+        for entry in retired:
+            _close_quietly(entry.connection)
+
+    def stats(self) -> PoolStats:
+        with self._cond:
+            return super().stats()
+
+    def _checkout(self, start, timeout):
+        retired, waited = [], False
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("connection pool is closed")
+
+                    now   = time.monotonic()
+                    entry = self._pop_idle(now, retired)
+                    if entry is not None:
+                        return entry, waited
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, waited
+
+                    remaining = timeout - (now - start)
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        raise self._timed_out(timeout)
+                    waited = True
+        finally:
+            for entry in retired:
+                _close_quietly(entry.connection)
+
+    def _create(self, reserved=False):
+        if not reserved:
+            with self._cond:
+                self._size += 1
+        try:
+            return PoolEntry(self.factory())
+        except:
+            with self._cond:
+                self._size -= 1
+                self._cond.notify()
+            raise
+
+    def _discard(self, entry):
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+        _close_quietly(entry.connection)
+
+    def _is_healthy(self, entry):
+        if not self._needs_healthcheck(entry):
+            return True
+        try:
+            with closing(entry.connection.cursor()) as cursor:
+                cursor.execute(self.healthcheck)
+            entry.connection.rollback()
+        except Exception:
+            return False
+        return True
+
+
+class AsyncConnectionPool(BasePool):
+    """
+    Pool of awaitable connections, such as those
+    returned by `aio.threaded` or `aiosqlite`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cond = asyncio.Condition()
+
+    async def open(self):
+        """
+        Fill the pool up to `min_size`. If any
+        connection fails, those already made are
+        closed before the error is raised.
+        """
+        self._closed, created = False, []
+        try:
+            for _ in range(self.min_size - self._size):
+                self._size += 1
+                created.append(await self._create())
+        except:
+            for entry in created:
+                await self._discard(entry)
+            raise
+        self._idle.extend(created)
+
+    async def close(self):
+        """
+        Close idle connections. Connections still in
+        use are closed as they are returned.
+        """
+        self._closed = True
+        idle, self._idle = list(self._idle), deque()
+        self._size -= len(idle)
+        async with self._cond:
+            self._cond.notify_all()
+        for entry in idle:
+            await _aclose_quietly(entry.connection)
+
+    @asynccontextmanager
+    async def acquire(self, timeout: float = None):
+        """Async counterpart of `acquire`."""
+        connection = await self.get(timeout)
+        try:
+            yield connection
+        except:
+            await self.put(connection, rollback=True)
+            raise
+        else:
+            await self.put(connection, commit=True)
+
+    async def get(self, timeout: float = None):
+        """Check out a connection from the pool."""
+        timeout = self.timeout if timeout is None else timeout
+        start   = time.monotonic()
+
+        while True:
+            entry, waited = await self._checkout(start, timeout)
+            if entry is None:
+                entry = await self._create()
+            elif not await self._is_healthy(entry):
+                await self._discard(entry)
+                continue
+            break
+
+        self._in_use[id(entry.connection)] = entry
+        self._record_wait(time.monotonic() - start, waited)
+        return entry.connection
+
+    async def put(self, connection, commit: bool = False, rollback: bool = False):
+        """Return a connection to the pool."""
+        entry = self._in_use.pop(id(connection))
+
+        try:
+            if commit:
+                await connection.commit()
+            elif rollback:
+                await connection.rollback()
+        except Exception:
+            await self._discard(entry)
+            if commit:
+                raise
+            return
+
+        entry.last_used = time.monotonic()
+        if self._closed:
+            await self._discard(entry)
+            return
+
+        retired = []
+        self._idle.append(entry)
+        self._reap(entry.last_used, retired)
+        async with self._cond:
+            self._cond.notify()
+        for entry in retired:
+            await _aclose_quietly(entry.connection)
+
+    async def _checkout(self, start, timeout):
+        retired, waited = [], False
+        try:
+            async with self._cond:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("connection pool is closed")
+
+                    now   = time.monotonic()
+                    entry = self._pop_idle(now, retired)
+                    if entry is not None:
+                        return entry, waited
+
+                    if self._size < self.max_size:
+                        self._size += 1
+                        return None, waited
+
+                    remaining = timeout - (now - start)
+                    try:
+                        if remaining <= 0:
+                            raise asyncio.TimeoutError
+                        await asyncio.wait_for(self._cond.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        raise self._timed_out(timeout) from None
+                    waited = True
+        finally:
+            for entry in retired:
+                await _aclose_quietly(entry.connection)
+
+    async def _create(self):
+        # the caller reserves the slot in `_size`.
+        try:
+            return PoolEntry(await maybe_await(self.factory()))
+        except:
+            self._size -= 1
+            async with self._cond:
+                self._cond.notify()
+            raise
+
+    async def _discard(self, entry):
+        self._size -= 1
+        async with self._cond:
+            self._cond.notify()
+        await _aclose_quietly(entry.connection)
+
+    async def _is_healthy(self, entry):
+        if not self._needs_healthcheck(entry):
+            return True
+        try:
+            cursor = await entry.connection.cursor()
+            try:
+                await cursor.execute(self.healthcheck)
+            finally:
+                await cursor.close()
+            await entry.connection.rollback()
+        except Exception:
+            return False
+        return True
+
+
+class PooledCursor:
+    """
+    Cursor holding a pooled connection until it is
+    closed.
+    """
+
+    def __init__(self, pool: ConnectionPool, connection: Any, cursor: Any):
+        self._pool       = pool
+        self._connection = connection
+        self._cursor     = cursor
+
+    @property
+    def closed(self):
+        return self._pool is None
+
+    @property
+    def connection(self):
+        return self._connection
+
+    def close(self, rollback: bool = False):
+        """Close the cursor and return its connection."""
+        if self._pool is None:
+            return
+        pool, self._pool = self._pool, None
+        try:
+            self._cursor.close()
+        finally:
+            pool.put(self._connection, commit=not rollback, rollback=rollback)
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close(rollback=type is not None)
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+async def _aclose_quietly(connection):
+    try:
+        await connection.close()
+    except Exception:
+        pass
@@ -0,0 +1,102 @@
+import threading
+import time
+
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, List
+
+from consumerlib.helpers.pools import ConnectionPool
+
+
+@dataclass
+class Replica:
+    host:        str
+    factory:     Callable[[], Any]
+    pool:        ConnectionPool = None
+    outstanding: int   = 0
+    down_until:  float = 0.0
+
+
+class ReplicaSet:
+    """
+    Read replicas balanced by least outstanding
+    requests, each with a pool of up to `pool_size`
+    connections. A replica marked down is skipped
+    for `retry_after` seconds, then reopened on its
+    next checkout.
+    """
+
+    def __init__(self, replicas: List[Replica], retry_after: float = 30.0, pool_size: int = 4):
+        self.retry_after = retry_after
+        self.pool_size   = pool_size
+
+        self._replicas = replicas
+        self._lock     = threading.Lock()
+
+    def __iter__(self):
+        return iter(self._replicas)
+
+    def __len__(self):
+        return len(self._replicas)
+
+    def connect(self) -> List[Replica]:
+        """Open every replica, returning those that failed."""
+        failed = []
+        for replica in self._replicas:
+            try:
+                self._pool(replica).open()
+            except Exception:
+                self.mark_down(replica)
+                failed.append(replica)
+        return failed
+
+    def close(self):
+        for replica in self._replicas:
+            _close_quietly(replica)
+
+    def candidates(self) -> List[Replica]:
+        """Available replicas, least outstanding first."""
+        with self._lock:
+            now = time.monotonic()
+            available = [r for r in self._replicas if r.down_until <= now]
+        return sorted(available, key=lambda r: r.outstanding)
+
+    @contextmanager
+    def checkout(self, replica: Replica):
+        """Count a request against `replica` while it runs."""
+        pool = self._pool(replica)
+        if pool.closed:
+            pool.open()
+
+        with self._lock:
+            replica.outstanding += 1
+        try:
+            with pool.acquire() as connection:
+                yield connection
+        finally:
+            with self._lock:
+                replica.outstanding -= 1
+
+    def mark_down(self, replica: Replica):
+        """Take `replica` out of rotation for `retry_after` seconds."""
+        with self._lock:
+            replica.down_until = time.monotonic() + self.retry_after
+        _close_quietly(replica)
+
+    def _pool(self, replica):
+        with self._lock:
+            if replica.pool is None:
+                replica.pool = ConnectionPool(
+                    replica.factory, min_size=1, max_size=self.pool_size)
+            return replica.pool
+
+
+def _close_quietly(replica):
+    # connections still checked out are closed
+    # as they are returned.
+    if replica.pool is None:
+        return
+    try:
+        replica.pool.close()
+    except Exception:
+        pass
@@ -0,0 +1,25 @@
+import random
+
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+
+@dataclass
+class ReconnectPolicy:
+    """
+    Exponential backoff with full jitter, used
+    between attempts to reopen an unhealthy client.
+    `attempts` of `None` retries indefinitely.
+    """
+    initial:  float         = 0.5
+    maximum:  float         = 30.0
+    factor:   float         = 2.0
+    attempts: Optional[int] = None
+
+    def delays(self) -> Iterator[float]:
+        """Seconds to wait before each attempt."""
+        ceiling, attempt = self.initial, 0
+        while self.attempts is None or attempt < self.attempts:
+            yield random.uniform(0, ceiling)
+            ceiling  = min(self.maximum, ceiling * self.factor)
+            attempt += 1
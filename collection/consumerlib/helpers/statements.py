@@ -0,0 +1,160 @@
+import itertools
+import re
+
+from collections import OrderedDict
+from dataclasses import dataclass, field as dc_field
+from typing import Any, Dict, Mapping, Optional, Tuple, Union
+
+import psycopg2.extensions
+
+
+PLACEHOLDER   = re.compile(r"%\((\w+)\)s|%s|%%")
+PREPARABLE    = ("select", "insert", "update", "delete", "values", "with")
+SEEN_CAPACITY = 4
+
+
+@dataclass
+class PreparedStatement:
+    name:   str
+    query:  str
+    count:  int
+    names:  Tuple[str, ...] = ()
+    hits:   int             = 0
+
+    @property
+    def execute_query(self):
+        if not self.count:
+            return f"EXECUTE {self.name}"
+        return f"EXECUTE {self.name} ({', '.join(['%s'] * self.count)})"
+
+    def bind(self, params: Union[Mapping[str, Any], Tuple]):
+        """Order parameters for `execute_query`."""
+        if self.names:
+            return tuple([params[n] for n in self.names])
+        return tuple(params or ())
+
+
+@dataclass
+class StatementStats:
+    prepared:  int = 0
+    hits:      int = 0
+    evictions: int = 0
+    queries:   Dict[str, int] = dc_field(default_factory=dict)
+
+
+class StatementCache:
+    """
+    LRU of statements prepared on a single
+    connection. Query text is prepared once seen
+    `threshold` times, or straight away if forced,
+    and deallocated when evicted.
+    """
+
+    def __init__(self, capacity: int = 100, threshold: Optional[int] = 5):
+        self.capacity  = capacity
+        self.threshold = threshold
+
+        self._names     = itertools.count()
+        self._prepared  = OrderedDict()
+        self._seen      = OrderedDict()
+        self._rejected  = set()
+        self._evictions = 0
+
+    def get(self, connection, query: str, force: bool = False) -> Optional[PreparedStatement]:
+        """
+        Get the prepared statement for `query`,
+        preparing it if it is due.
+        """
+        statement = self._prepared.get(query)
+        if statement is not None:
+            self._prepared.move_to_end(query)
+            statement.hits += 1
+            return statement
+
+        if query in self._rejected:
+            return None
+
+        seen = self._seen.pop(query, 0) + 1
+        self._seen[query] = seen
+        while len(self._seen) > self.capacity * SEEN_CAPACITY:
+            self._seen.popitem(last=False)
+
+        if force or (self.threshold is not None and seen >= self.threshold):
+            return self._prepare(connection, query)
+        return None
+
+    def stats(self) -> StatementStats:
+        return StatementStats(
+            prepared=len(self._prepared),
+            hits=sum([s.hits for s in self._prepared.values()]),
+            evictions=self._evictions,
+            queries={q: s.hits for q, s in self._prepared.items()})
+
+    def _prepare(self, connection, query):
+        statement = _parse_statement(f"stmt_{next(self._names)}", query)
+        if statement is None or run_guarded(connection, _prepare_query(statement)) is None:
+            self._rejected.add(query)
+            return None
+
+        self._seen.pop(query, None)
+        self._prepared[query] = statement
+        while len(self._prepared) > self.capacity:
+            _, evicted = self._prepared.popitem(last=False)
+            run_guarded(connection, f"DEALLOCATE {evicted.name}")
+            self._evictions += 1
+        return statement
+
+
+def _parse_statement(name, query):
+    if not query.lstrip().lower().startswith(PREPARABLE):
+        return None
+
+    names, count, positional = [], 0, False
+
+    def replace(match):
+        nonlocal count, positional
+        if match.group(0) == "%%":
+            return "%"
+        if match.group(1) is None:
+            positional = True
+            count += 1
+            return f"${count}"
+        if match.group(1) not in names:
+            names.append(match.group(1))
+        return f"${names.index(match.group(1)) + 1}"
+
+    text = PLACEHOLDER.sub(replace, query)
+    if positional and names:
+        return None
+
+    count = count or len(names)
+    return PreparedStatement(name, text, count, tuple(names))
+
+
+def _prepare_query(statement):
+    return f"PREPARE {statement.name} AS {statement.query}"
+
+
+def run_guarded(connection, query: str, params=None):
+    """
+    Run `query` without letting a failure abort the
+    caller's open transaction. Returns the fetched
+    rows, or `None` if the query failed.
+    """
+    status = connection.get_transaction_status()
+    in_transaction = status != psycopg2.extensions.TRANSACTION_STATUS_IDLE
+    with connection.cursor() as cursor:
+        try:
+            if in_transaction:
+                cursor.execute("SAVEPOINT guarded_query")
+            cursor.execute(query, params)
+            rows = cursor.fetchall() if cursor.description else []
+        except Exception:
+            if in_transaction:
+                cursor.execute("ROLLBACK TO SAVEPOINT guarded_query")
+            else:
+                connection.rollback()
+            return None
+        if in_transaction:
+            cursor.execute("RELEASE SAVEPOINT guarded_query")
+    return rows
@@ -1,10 +1,38 @@
+import asyncio
+import collections
+import contextlib
 import enum
+import errno
 import functools
+import hashlib
+import heapq
+import itertools
+import mmap
+import os
+import selectors
+import signal
 import socket
+import struct
+import threading
+import time
 import warnings
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field as dc_field
 from socket import AddressFamily, SocketKind
+from typing import Any, Awaitable, Callable
+
+try:
+    import uvloop
+except ImportError: # not available on windows
+    uvloop = None
+
+
+FILE_HEADER    = struct.Struct("!Q")
+FRAME_HEADER   = struct.Struct("!I")
+MAX_FILE_SIZE  = 4 * 1024 ** 3
+MAX_FRAME_SIZE = 16 * 1024 ** 2
+
+StreamHandler = Callable[[asyncio.StreamReader, asyncio.StreamWriter], Awaitable[None]]
 
 
 def getclass(inst: object):
@@ -21,7 +49,7 @@ def not_implemented(func):
 
 
 class SocketDataClass:
-    __dataclass_fields__ = dict()
+    __dataclass_fields__: dict
 
     def asiterable(self):
         iterable = dict()
@@ -37,11 +65,326 @@ class SocketAttributes(SocketDataClass):
     proto:            int = -1
     fileno:           int = None
 
+    # TCP options, applied once the socket is made.
+    nodelay:            bool = False
+    keepalive:          bool = False
+    keepalive_idle:     int  = None
+    keepalive_interval: int  = None
+    keepalive_count:    int  = None
+
+    def make_socket(self) -> socket.socket:
+        """Make a socket with these attributes."""
+        sock = socket.socket(self.family, self.type, self.proto, self.fileno)
+        try:
+            self.apply(sock)
+        except:
+            sock.close()
+            raise
+        return sock
+
+    def apply(self, sock: socket.socket):
+        """Set the TCP options on `sock`."""
+        if self.type != socket.SOCK_STREAM or self.family not in (socket.AF_INET, socket.AF_INET6):
+            return
+        if self.nodelay:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        if not self.keepalive:
+            return
+
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        options = (
+            ("TCP_KEEPIDLE", self.keepalive_idle),
+            ("TCP_KEEPINTVL", self.keepalive_interval),
+            ("TCP_KEEPCNT", self.keepalive_count))
+        for name, value in options:
+            if value is not None and hasattr(socket, name):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, name), value)
+
 
 @dataclass
 class SocketConnection(SocketDataClass):
-    connection: socket.socket
-    retaddress: str
+    connection:     socket.socket
+    retaddress:     str
+    max_frame_size: int = MAX_FRAME_SIZE
+    framer:      "Framer" = dc_field(default=None, repr=False)
+
+    def __post_init__(self):
+        if self.framer is None:
+            self.framer = Framer(self.connection, self.max_frame_size)
+
+    def send(self, data: bytes):
+        """Send `data` as one frame."""
+        self.framer.send(data)
+
+    def recv(self) -> memoryview:
+        """
+        Receive one frame. The view is only valid
+        until the next `recv`.
+        """
+        return self.framer.recv()
+
+    def send_file(self, path: str | os.PathLike, offset: int = 0, count: int = None, checksum: str = None):
+        """Send a file, or `count` bytes of it from `offset`."""
+        self.framer.send_file(path, offset, count, checksum)
+
+    def recv_file(self, path: str | os.PathLike, max_size: int = MAX_FILE_SIZE) -> int:
+        """Receive a file sent by `send_file` into `path`."""
+        return self.framer.recv_file(path, max_size)
+
+    def close(self):
+        self.connection.close()
+
+
+class SocketFrameError(Exception):
+    """Raise if a frame is malformed or too large."""
+
+
+class SocketTransferError(Exception):
+    """Raise if a received file is too large or fails its checksum."""
+
+
+class FrameBuffer:
+    """
+    Reusable receive buffer. Data is read with
+    `recv_into` after the unread bytes, which are
+    moved back to the start only once the free
+    space at the end runs out.
+    """
+
+    def __init__(self, size: int = 64 * 1024):
+        self._buffer = bytearray(size)
+        self._view   = memoryview(self._buffer)
+        self._start  = 0
+        self._end    = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def capacity(self):
+        return len(self._buffer)
+
+    def peek(self, size: int) -> memoryview:
+        return self._view[self._start:self._start + size]
+
+    def consume(self, size: int) -> memoryview:
+        view = self.peek(size)
+        self._start += size
+        if self._start == self._end:
+            self._start = self._end = 0
+        return view
+
+    def reserve(self, size: int):
+        """Make room for `size` unread bytes."""
+        if size > self.capacity:
+            self._resize(size)
+        elif self._start + size > self.capacity:
+            self._compact()
+
+    def recv_from(self, sock: socket.socket) -> int:
+        """Receive into the free space, returning the bytes read."""
+        if self._end == self.capacity:
+            self._compact()
+        count = sock.recv_into(self._view[self._end:])
+        self._end += count
+        return count
+
+    def _compact(self):
+        unread = len(self)
+        self._buffer[:unread] = self._view[self._start:self._end]
+        self._start, self._end = 0, unread
+
+    def _resize(self, size):
+        unread = bytes(self._view[self._start:self._end])
+        self._view.release()
+        self._buffer = bytearray(size)
+        self._view   = memoryview(self._buffer)
+        self._buffer[:len(unread)] = unread
+        self._start, self._end = 0, len(unread)
+
+
+class Framer:
+    """
+    Length-prefixed frames over a blocking socket.
+    Each frame is a 4 byte big-endian length
+    followed by that many bytes.
+    """
+
+    def __init__(self, sock: socket.socket, max_frame_size: int = MAX_FRAME_SIZE, buffer_size: int = 64 * 1024):
+        self.socket         = sock
+        self.max_frame_size = max_frame_size
+        self.buffer         = FrameBuffer(buffer_size)
+
+    def send(self, payload: bytes):
+        """
+        Send one frame, gathering the header and
+        payload in one `sendmsg` call.
+        """
+        size = len(payload)
+        if size > self.max_frame_size:
+            raise SocketFrameError(f"frame of {size} bytes exceeds {self.max_frame_size}")
+        _sendmsg_all(self.socket, [FRAME_HEADER.pack(size), payload], FRAME_HEADER.size + size)
+
+    def recv(self) -> memoryview:
+        """
+        Receive one frame. The view is only valid
+        until the next `recv`.
+        """
+        size  = self._recv_size()
+        total = FRAME_HEADER.size + size
+        if len(self.buffer) < total:
+            self.buffer.reserve(total)
+            self._fill(total)
+        return self.buffer.consume(total)[FRAME_HEADER.size:]
+
+    def send_file(self, path: str | os.PathLike, offset: int = 0, count: int = None, checksum: str = None):
+        """
+        Send a file, or `count` bytes of it from
+        `offset`, with `socket.sendfile` so the data
+        goes from the page cache to the socket in
+        the kernel. A frame carrying the size, and
+        the name of the `checksum` algorithm if any,
+        comes first, and one carrying the digest
+        comes last.
+        """
+        with open(path, "rb") as stream:
+            size = os.fstat(stream.fileno()).st_size
+            if not 0 <= offset <= size:
+                raise ValueError(f"offset {offset} is outside {str(path)!r} of {size} bytes")
+            if count is not None and count < 0:
+                raise ValueError(f"count must not be negative, not {count}")
+            count = size - offset if count is None else min(count, size - offset)
+            self.send(FILE_HEADER.pack(count) + (checksum or "").encode())
+
+            if count:
+                self.socket.sendfile(stream, offset, count)
+            if checksum:
+                self.send(_file_digest(stream, checksum, offset, count))
+
+    def recv_file(self, path: str | os.PathLike, max_size: int = MAX_FILE_SIZE) -> int:
+        """
+        Receive a file sent by `send_file` straight
+        into a preallocated, memory mapped `path`.
+        Returns the bytes received. Files over
+        `max_size` are refused before anything is
+        allocated, leaving the connection unusable.
+        """
+        header = self.recv()
+        count, = FILE_HEADER.unpack(header[:FILE_HEADER.size])
+        checksum = bytes(header[FILE_HEADER.size:]).decode()
+        if max_size is not None and count > max_size:
+            raise SocketTransferError(f"file of {count} bytes exceeds {max_size}")
+
+        with open(path, "w+b") as stream:
+            stream.truncate(count)
+            if count:
+                self._recv_mapped(stream, count)
+            if checksum:
+                expected = bytes(self.recv())
+                if _file_digest(stream, checksum, 0, count) != expected:
+                    raise SocketTransferError(f"{checksum} checksum of {str(path)!r} does not match")
+        return count
+
+    def _recv_mapped(self, stream, count):
+        with mmap.mmap(stream.fileno(), count) as mapped:
+            view = memoryview(mapped)
+            try:
+                # bytes already buffered by an earlier
+                # `recv` go in first.
+                received = min(len(self.buffer), count)
+                view[:received] = self.buffer.consume(received)
+                while received < count:
+                    size = self.socket.recv_into(view[received:])
+                    if not size:
+                        raise ConnectionError("connection closed mid file")
+                    received += size
+            finally:
+                view.release()
+
+    def _recv_size(self):
+        self._fill(FRAME_HEADER.size)
+        size, = FRAME_HEADER.unpack(self.buffer.peek(FRAME_HEADER.size))
+        if size > self.max_frame_size:
+            raise SocketFrameError(f"frame of {size} bytes exceeds {self.max_frame_size}")
+        return size
+
+    def _fill(self, size):
+        while len(self.buffer) < size:
+            if not self.buffer.recv_from(self.socket):
+                raise ConnectionError("connection closed mid frame")
+
+
+def iter_frames(buffer: bytearray, max_frame_size: int = MAX_FRAME_SIZE):
+    """
+    Take each complete frame from the front of
+    `buffer`, leaving any partial frame.
+    """
+    offset, view = 0, memoryview(buffer)
+    try:
+        while len(buffer) - offset >= FRAME_HEADER.size:
+            size, = FRAME_HEADER.unpack_from(buffer, offset)
+            if size > max_frame_size:
+                raise SocketFrameError(f"frame of {size} bytes exceeds {max_frame_size}")
+            end = offset + FRAME_HEADER.size + size
+            if end > len(buffer):
+                break
+            yield bytes(view[offset + FRAME_HEADER.size:end])
+            offset = end
+    finally:
+        view.release()
+        del buffer[:offset]
+
+
+def _file_digest(stream, algorithm: str, offset: int, count: int) -> bytes:
+    digest = hashlib.new(algorithm)
+    if count:
+        # mmap offsets must be page aligned.
+        start = offset - offset % mmap.ALLOCATIONGRANULARITY
+        with mmap.mmap(stream.fileno(), offset - start + count, offset=start, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                digest.update(view[offset - start:])
+    return digest.digest()
+
+
+def pack_frame(payload: bytes) -> list:
+    """Header and payload of a frame, for scatter-gather writes."""
+    return [FRAME_HEADER.pack(len(payload)), payload]
+
+
+async def read_frame(reader: asyncio.StreamReader, max_frame_size: int = MAX_FRAME_SIZE) -> bytes:
+    """Read one frame from an asyncio stream."""
+    size, = FRAME_HEADER.unpack(await reader.readexactly(FRAME_HEADER.size))
+    if size > max_frame_size:
+        raise SocketFrameError(f"frame of {size} bytes exceeds {max_frame_size}")
+    return await reader.readexactly(size)
+
+
+async def write_frame(writer: asyncio.StreamWriter, payload: bytes):
+    """Write one frame to an asyncio stream."""
+    writer.writelines(pack_frame(payload))
+    await writer.drain()
+
+
+def _sendmsg_all(sock: socket.socket, buffers: list, total: int):
+    if not hasattr(sock, "sendmsg"): # windows
+        for buffer in buffers:
+            sock.sendall(buffer)
+        return
+
+    sent = sock.sendmsg(buffers)
+    if sent == total:
+        return
+
+    # resume a partial send from where it stopped.
+    buffers = [memoryview(b) for b in buffers]
+    while True:
+        while buffers and sent >= len(buffers[0]):
+            sent -= len(buffers[0])
+            buffers.pop(0)
+        if not buffers:
+            return
+        buffers[0] = buffers[0][sent:]
+        sent = sock.sendmsg(buffers)
 
 
 class SocketStatus(enum.IntEnum):
@@ -49,6 +392,331 @@ class SocketStatus(enum.IntEnum):
     CLOSED: int = enum.auto()
 
 
+class ConnectionHandler:
+    """
+    Callbacks of a `Reactor` connection. Received
+    data waits in `connection.read_buffer` until
+    consumed by `readable`.
+    """
+
+    def connected(self, connection: "ReactorConnection"):
+        """Connection was accepted or established."""
+
+    def readable(self, connection: "ReactorConnection"):
+        """Data was added to the read buffer."""
+
+    def writable(self, connection: "ReactorConnection"):
+        """The write buffer was flushed."""
+
+    def closed(self, connection: "ReactorConnection"):
+        """Connection was closed by either end."""
+
+
+class FrameHandler(ConnectionHandler):
+    """
+    Handler receiving length-prefixed frames via
+    `frame` instead of raw buffered data.
+    """
+    max_frame_size = MAX_FRAME_SIZE
+
+    def readable(self, connection: "ReactorConnection"):
+        try:
+            for payload in iter_frames(connection.read_buffer, self.max_frame_size):
+                self.frame(connection, payload)
+        except SocketFrameError:
+            connection.close()
+
+    def frame(self, connection: "ReactorConnection", payload: bytes):
+        """A complete frame was received."""
+
+    def send_frame(self, connection: "ReactorConnection", payload: bytes):
+        """Queue `payload` as one frame."""
+        for part in pack_frame(payload):
+            connection.write(part)
+
+
+class ReactorConnection:
+    """Non-blocking socket buffered by a `Reactor`."""
+
+    def __init__(
+        self, reactor: "Reactor", sock: socket.socket, address: Any,
+        handler: ConnectionHandler, owner: "BaseSocket" = None):
+        self.reactor      = reactor
+        self.owner        = owner
+        self.socket       = sock
+        self.address      = address
+        self.handler      = handler
+        self.read_buffer  = bytearray()
+        self.write_buffer = bytearray()
+        self.connecting   = False
+        self.closed       = False
+
+    def write(self, data: bytes):
+        """Queue data, sent once the socket is writable."""
+        if self.closed:
+            raise ConnectionError("connection is closed")
+        self.write_buffer += data
+        self.reactor._update_events(self)
+
+    def close(self):
+        """Close the connection, discarding unsent data."""
+        self.reactor._close_connection(self)
+
+
+class Timer:
+    """Callback scheduled on a `Reactor`."""
+
+    def __init__(self, when: float, interval: float | None, callback: Callable, args: tuple):
+        self.when      = when
+        self.interval  = interval
+        self.callback  = callback
+        self.args      = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Reactor:
+    """
+    Single threaded event loop multiplexing many
+    non-blocking sockets over `selectors` (epoll
+    where available).
+    """
+
+    def __init__(self, read_size: int = 64 * 1024):
+        self.read_size = read_size
+
+        self._selector = selectors.DefaultSelector()
+        self._timers   = []
+        self._sequence = itertools.count()
+        self._running  = False
+        self._buffer   = bytearray(read_size)
+
+        # lets `stop` and `call_soon` from other
+        # threads wake a blocked `select`.
+        self._wakeup, self._waker = socket.socketpair()
+        self._wakeup.setblocking(False)
+        self._waker.setblocking(False)
+        self._selector.register(self._wakeup, selectors.EVENT_READ, (self._drain_wakeup, None))
+        self._pending = []
+        self._lock    = threading.Lock()
+        self._thread  = None
+
+    def add_server(self, server: "BaseServerSocket", handler: Callable[[], ConnectionHandler], backlog: int = 128):
+        """
+        Accept connections on an opened server
+        socket, each given a handler from `handler`.
+        """
+        sock = server.socket
+        sock.listen(backlog)
+        sock.setblocking(False)
+        self._selector.register(sock, selectors.EVENT_READ, (self._accept, handler))
+
+    def remove_server(self, server: "BaseServerSocket"):
+        self._selector.unregister(server.socket)
+
+    def connect(self, client: "BaseClientSocket", handler: ConnectionHandler) -> ReactorConnection:
+        """Connect a client socket without blocking."""
+        sock = client._attributes.make_socket()
+        sock.setblocking(False)
+        code = sock.connect_ex((client._host, client._port))
+        if code not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            sock.close()
+            raise OSError(code, f"connect to {client._host}:{client._port} failed")
+
+        client._socket        = sock
+        client._socket_status = SocketStatus.OPEN
+
+        connection = ReactorConnection(self, sock, (client._host, client._port), handler, client)
+        connection.connecting = True
+        self._selector.register(sock, selectors.EVENT_WRITE, (self._serve, connection))
+        return connection
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """Run `callback` once after `delay` seconds."""
+        return self._schedule(Timer(time.monotonic() + delay, None, callback, args))
+
+    def call_every(self, interval: float, callback: Callable, *args) -> Timer:
+        """Run `callback` every `interval` seconds."""
+        return self._schedule(Timer(time.monotonic() + interval, interval, callback, args))
+
+    def call_soon(self, callback: Callable, *args):
+        """Run `callback` on the reactor thread. Thread safe."""
+        with self._lock:
+            self._pending.append((callback, args))
+        self._wake()
+
+    def run(self, timeout: float = None):
+        """
+        Run until stopped, or for `timeout` seconds
+        if given.
+        """
+        self._running = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._running:
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            self.run_once(self._select_timeout(deadline))
+        self._running = False
+
+    def run_once(self, timeout: float = None):
+        """Handle ready sockets and due timers once."""
+        self._thread = threading.get_ident()
+        for key, events in self._selector.select(timeout):
+            callback, data = key.data
+            callback(key.fileobj, events, data)
+        self._run_timers()
+        self._run_pending()
+
+    def stop(self):
+        """Stop `run`. Thread safe."""
+        self._running = False
+        self._wake()
+
+    def close(self):
+        """Close every connection and the reactor."""
+        for key in list(self._selector.get_map().values()):
+            if isinstance(key.data[1], ReactorConnection):
+                self._close_connection(key.data[1])
+        self._selector.close()
+        self._wakeup.close()
+        self._waker.close()
+
+    def _schedule(self, timer):
+        heapq.heappush(self._timers, (timer.when, next(self._sequence), timer))
+        self._wake()
+        return timer
+
+    def _select_timeout(self, deadline):
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if self._timers:
+            due = max(0.0, self._timers[0][0] - time.monotonic())
+            timeout = due if timeout is None else min(timeout, due)
+        return timeout
+
+    def _run_timers(self):
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, timer = heapq.heappop(self._timers)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                timer.when = now + timer.interval
+                self._schedule(timer)
+            timer.callback(*timer.args)
+
+    def _run_pending(self):
+        with self._lock:
+            pending, self._pending = self._pending, []
+        for callback, args in pending:
+            callback(*args)
+
+    def _wake(self):
+        # the reactor thread rechecks timers and
+        # pending calls before it selects again.
+        if threading.get_ident() == self._thread:
+            return
+        try:
+            self._waker.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass # already awake, or closed
+
+    def _drain_wakeup(self, sock, events, data):
+        try:
+            while sock.recv(4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _accept(self, sock, events, handler):
+        while True:
+            try:
+                conn, address = sock.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            conn.setblocking(False)
+            connection = ReactorConnection(self, conn, address, handler())
+            self._selector.register(conn, selectors.EVENT_READ, (self._serve, connection))
+            connection.handler.connected(connection)
+
+    def _serve(self, sock, events, connection):
+        if connection.connecting:
+            self._finish_connect(connection)
+            return
+        if events & selectors.EVENT_READ:
+            self._read(connection)
+        if events & selectors.EVENT_WRITE and not connection.closed:
+            self._flush(connection)
+
+    def _finish_connect(self, connection):
+        code = connection.socket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if code:
+            self._close_connection(connection)
+            return
+        connection.connecting = False
+        self._update_events(connection)
+        connection.handler.connected(connection)
+
+    def _read(self, connection):
+        view, received = memoryview(self._buffer), False
+        while True:
+            try:
+                count = connection.socket.recv_into(view)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                count = 0
+            if not count:
+                # data read before the peer closed is
+                # still handed over first.
+                if received:
+                    connection.handler.readable(connection)
+                self._close_connection(connection)
+                return
+            connection.read_buffer += view[:count]
+            received = True
+            if count < len(view):
+                break
+        connection.handler.readable(connection)
+
+    def _flush(self, connection):
+        try:
+            sent = connection.socket.send(connection.write_buffer)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            self._close_connection(connection)
+            return
+
+        del connection.write_buffer[:sent]
+        self._update_events(connection)
+        if not connection.write_buffer:
+            connection.handler.writable(connection)
+
+    def _update_events(self, connection):
+        if connection.closed or connection.connecting:
+            return
+        events = selectors.EVENT_READ
+        if connection.write_buffer:
+            events |= selectors.EVENT_WRITE
+        self._selector.modify(connection.socket, events, (self._serve, connection))
+
+    def _close_connection(self, connection):
+        if connection.closed:
+            return
+        connection.closed = True
+        try:
+            self._selector.unregister(connection.socket)
+        except (KeyError, ValueError):
+            pass
+        connection.socket.close()
+        if connection.owner is not None:
+            connection.owner._socket        = getclass(connection.owner)._socket
+            connection.owner._socket_status = getclass(connection.owner)._socket_status
+        connection.handler.closed(connection)
+
+
 class SocketOpenWarning(Warning):
     """Warn if a socket is never closed."""
 
@@ -58,6 +726,8 @@ class SocketType(type):
 
 
 class BaseSocket(metaclass=SocketType):
+    max_frame_size = MAX_FRAME_SIZE
+
     _socket        = socket.socket
     _socket_status = SocketStatus.CLOSED
 
@@ -65,7 +735,8 @@ class BaseSocket(metaclass=SocketType):
         """Init a SocketType object."""
         self._host  = host
         self._port  = port
-        self._attrs = SocketAttributes(**attrs).asiterable()
+        self._attributes = SocketAttributes(**attrs)
+        self._attrs      = self._attributes.asiterable()
 
     def __repr__(self):
         return (
@@ -101,10 +772,10 @@ class BaseServerSocket(BaseSocket):
 
     def listen(self, backlog: int = 0):
         self._socket.listen(backlog)
-        return SocketConnection(*self._socket.accept())
+        return SocketConnection(*self._socket.accept(), self.max_frame_size)
 
     def __open__(self):
-        self._socket = self._socket(**self._attrs)
+        self._socket = self._attributes.make_socket()
         self._socket.bind((self._host, self._port))
         self._socket_status = SocketStatus.OPEN
 
@@ -122,6 +793,7 @@ class BaseServerSocket(BaseSocket):
 
 
 class BaseClientSocket(BaseSocket):
+    _framer = None
 
     def connect(self):
         self.__connect__()
@@ -129,17 +801,42 @@ class BaseClientSocket(BaseSocket):
     def detach(self):
         self.__detach__()
 
-    @not_implemented
-    def send(self, data, *args, **kwargs):
-        return NotImplemented
+    def close(self):
+        self.__detach__()
+
+    def send(self, data: bytes):
+        """Send `data` as one frame."""
+        self._get_framer().send(data)
+
+    def recv(self) -> memoryview:
+        """
+        Receive one frame. The view is only valid
+        until the next `recv`.
+        """
+        return self._get_framer().recv()
+
+    def send_file(self, path: str | os.PathLike, offset: int = 0, count: int = None, checksum: str = None):
+        """Send a file, or `count` bytes of it from `offset`."""
+        self._get_framer().send_file(path, offset, count, checksum)
+
+    def recv_file(self, path: str | os.PathLike, max_size: int = MAX_FILE_SIZE) -> int:
+        """Receive a file sent by `send_file` into `path`."""
+        return self._get_framer().recv_file(path, max_size)
+
+    def _get_framer(self):
+        if self._framer is None:
+            raise ConnectionError(f"{getclass(self).__name__} is not connected")
+        return self._framer
 
     def __connect__(self):
-        self._socket = self._socket(**self._attrs)
+        self._socket = self._attributes.make_socket()
         self._socket.connect((self._host, self._port))
+        self._framer = Framer(self._socket, self.max_frame_size)
         self._socket_status = SocketStatus.OPEN
 
     def __detach__(self):
-        self._socket.detach()
+        self._socket.close()
+        self._framer        = None
         self._socket        = getclass(self)._socket
         self._socket_status = getclass(self)._socket_status
 
@@ -151,6 +848,135 @@ class BaseClientSocket(BaseSocket):
         self.detach()
 
 
+class BaseAsyncServerSocket(BaseSocket):
+    backlog       = 128
+    reuse_address = True
+    reuse_port    = False
+    use_uvloop    = True
+
+    _server  = None
+    _handler = None
+    _tasks   = None
+
+    async def open(self, handler: StreamHandler = None):
+        """
+        Start accepting connections, each served by
+        `handler` or `handle` in its own task.
+        """
+        await self.__open__(handler or self.handle)
+
+    async def close(self, timeout: float = None):
+        """
+        Stop accepting connections, then give open
+        connections `timeout` seconds to finish
+        before cancelling them.
+        """
+        await self.__close__(timeout)
+
+    async def serve(self, handler: StreamHandler = None):
+        """Serve connections until closed."""
+        if self._socket_status != SocketStatus.OPEN:
+            await self.open(handler)
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    def run(self, handler: StreamHandler = None, timeout: float = None):
+        """
+        Serve on a new event loop, uvloop's if
+        available, until interrupted.
+        """
+        loop = uvloop.new_event_loop() if uvloop and self.use_uvloop else asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._run(handler, timeout))
+        finally:
+            loop.close()
+
+    @not_implemented
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        return NotImplemented
+
+    async def _run(self, handler, timeout):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(signum, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass # signals are not supported here
+
+        await self.open(handler)
+        serving  = asyncio.ensure_future(self.serve())
+        stopping = asyncio.ensure_future(stop.wait())
+        try:
+            await asyncio.wait([serving, stopping], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            await self.close(timeout)
+            serving.cancel()
+            stopping.cancel()
+
+    async def _serve_connection(self, reader, writer):
+        task = asyncio.current_task()
+        self._tasks.add(task)
+        try:
+            await self._handler(reader, writer)
+        except asyncio.CancelledError:
+            pass # cancelled on shutdown
+        finally:
+            self._tasks.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass # the peer is already gone
+
+    async def __open__(self, handler):
+        sock = self._attributes.make_socket()
+        try:
+            if self.reuse_address:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            if self.reuse_port:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            sock.bind((self._host, self._port))
+            sock.setblocking(False)
+
+            self._handler = handler
+            self._tasks   = set()
+            self._server  = await asyncio.start_server(
+                self._serve_connection, sock=sock, backlog=self.backlog)
+        except:
+            sock.close()
+            raise
+
+        self._socket        = sock
+        self._socket_status = SocketStatus.OPEN
+
+    async def __close__(self, timeout):
+        server, self._server = self._server, None
+        if server is not None:
+            server.close()
+
+        tasks = list(self._tasks or ())
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=timeout)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        if server is not None:
+            await server.wait_closed()
+
+        self._socket        = getclass(self)._socket
+        self._socket_status = getclass(self)._socket_status
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, etype, eval, tback):
+        await self.close()
+
+
 class ServerSocket(BaseServerSocket):
     """
     SocketType object intended for opening
@@ -163,3 +989,158 @@ class ClientSocket(BaseClientSocket):
     SocketType object intended for sending
     data to listening ports.
     """
+
+
+class AsyncServerSocket(BaseAsyncServerSocket):
+    """
+    SocketType object serving many connections
+    at once on an asyncio event loop.
+    """
+
+
+class ClientSocketPool:
+    """
+    Connected client sockets kept for reuse, keyed
+    by host, port and socket attributes. At most
+    `max_size` connections are open per key, and
+    idle ones are closed after `idle_timeout`.
+    """
+
+    def __init__(
+        self, max_size: int = 8, idle_timeout: float = 60.0,
+        timeout: float = 30.0, client_class: type = ClientSocket):
+        self.max_size     = max_size
+        self.idle_timeout = idle_timeout
+        self.timeout      = timeout
+        self.client_class = client_class
+
+        self._idle   = collections.defaultdict(list)
+        self._counts = collections.Counter()
+        self._closed = False
+        self._cond   = threading.Condition()
+
+    @contextlib.contextmanager
+    def acquire(self, host: str, port: int, **attrs):
+        """
+        Check out a connected client for the
+        duration of the context. Clients are closed
+        rather than reused if the context fails.
+        """
+        client = self.get(host, port, **attrs)
+        try:
+            yield client
+        except:
+            self.put(client, discard=True)
+            raise
+        else:
+            self.put(client)
+
+    def get(self, host: str, port: int, timeout: float = None, **attrs) -> BaseClientSocket:
+        """Check out a connected client."""
+        key     = _pool_key(host, port, SocketAttributes(**attrs))
+        timeout = self.timeout if timeout is None else timeout
+        start   = time.monotonic()
+
+        while True:
+            client = self._checkout(key, start, timeout)
+            if client is None:
+                return self._connect(key, host, port, attrs)
+            if _is_alive(client):
+                return client
+            self._discard(key, client)
+
+    def put(self, client: BaseClientSocket, discard: bool = False):
+        """Return a client checked out of the pool."""
+        key = _pool_key(client._host, client._port, client._attributes)
+
+        # unread data means the exchange on this
+        # connection did not finish cleanly.
+        unread = client._framer is not None and len(client._framer.buffer)
+        if discard or unread or self._closed or client.status != SocketStatus.OPEN:
+            self._discard(key, client)
+            return
+
+        with self._cond:
+            self._idle[key].append((time.monotonic(), client))
+            self._cond.notify_all()
+
+    def close(self):
+        """
+        Close idle clients. Clients still checked
+        out are closed as they are returned.
+        """
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, collections.defaultdict(list)
+            for key, entries in idle.items():
+                self._counts[key] -= len(entries)
+            self._cond.notify_all()
+        for entries in idle.values():
+            for _, client in entries:
+                client.close()
+
+    def _checkout(self, key, start, timeout):
+        expired = []
+        try:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise ConnectionError("client socket pool is closed")
+
+                    now, idle = time.monotonic(), self._idle[key]
+                    while idle:
+                        used, client = idle.pop()
+                        if now - used <= self.idle_timeout:
+                            return client
+                        self._counts[key] -= 1
+                        expired.append(client)
+
+                    if self._counts[key] < self.max_size:
+                        self._counts[key] += 1
+                        return None
+
+                    remaining = timeout - (now - start)
+                    if remaining <= 0 or not self._cond.wait(remaining):
+                        raise TimeoutError(f"timed out after {timeout}s waiting for a connection")
+        finally:
+            for client in expired:
+                client.close()
+
+    def _connect(self, key, host, port, attrs):
+        client = self.client_class(host, port, **attrs)
+        try:
+            client.connect()
+        except:
+            with self._cond:
+                self._counts[key] -= 1
+                self._cond.notify_all()
+            raise
+        return client
+
+    def _discard(self, key, client):
+        with self._cond:
+            self._counts[key] -= 1
+            self._cond.notify_all()
+        if client.status == SocketStatus.OPEN:
+            client.close()
+
+
+def _is_alive(client: BaseClientSocket):
+    # a readable idle connection was either closed
+    # by the peer or holds data nobody asked for.
+    sock, timeout = client.socket, client.socket.gettimeout()
+    try:
+        sock.settimeout(0)
+        sock.recv(1, socket.MSG_PEEK)
+    except (BlockingIOError, InterruptedError):
+        return True
+    except OSError:
+        return False
+    finally:
+        with contextlib.suppress(OSError):
+            sock.settimeout(timeout)
+    return False
+
+
+def _pool_key(host, port, attributes: SocketAttributes):
+    return host, port, tuple(attributes.asiterable().items())
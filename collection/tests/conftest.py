@@ -0,0 +1,6 @@
+import pathlib
+import sys
+
+# modules in `collection` are imported top-level,
+# as they are when installed.
+sys.path.insert(0, str(pathlib.Path(__file__).parents[1]))
@@ -0,0 +1,109 @@
+import asyncio
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from clientlib import AsyncBaseAPIClient, ClientValidationError
+
+
+async def echo(request):
+    return web.json_response({
+        "method":  request.method,
+        "path":    request.path,
+        "query":   dict(request.query),
+        "headers": {"X-Example": request.headers.get("X-Example")},
+    })
+
+
+async def failure(request):
+    return web.Response(status=503)
+
+
+def run_with_server(scenario):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/fail", failure)
+        app.router.add_route("*", "/{tail:.*}", echo)
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        try:
+            return await scenario(f"http://127.0.0.1:{port}")
+        finally:
+            await runner.cleanup()
+    return asyncio.run(main())
+
+
+def client_class(root_uri, **namespace):
+    namespace = {"max_timeout": 5.0, "root_uri": root_uri, **namespace}
+    return type("Client", (AsyncBaseAPIClient,), namespace)
+
+
+def test_send_reads_body_and_applies_settings():
+    async def scenario(uri):
+        Client = client_class(uri, headers={"X-Example": "1"})
+        async with Client() as client:
+            resp = await client.send("get", "items", params={"page": "2"})
+            assert resp.status == 200
+            assert await resp.json() == {
+                "method":  "GET",
+                "path":    "/items",
+                "query":   {"page": "2"},
+                "headers": {"X-Example": "1"},
+            }
+    run_with_server(scenario)
+
+
+def test_session_opens_lazily_and_refreshes():
+    async def scenario(uri):
+        client = client_class(uri)()
+        assert client.__session__ is None
+        assert (await client.send("post", "a")).status == 200
+
+        session = client.__session__
+        await client.refresh()
+        assert session.closed and client.__session__ is not session
+        await client.close()
+        assert client.__session__ is None
+    run_with_server(scenario)
+
+
+def test_healthcheck_uses_healthcheck_uri():
+    async def scenario(uri):
+        Client = client_class("http://127.0.0.1:1", healthcheck_uri=f"{uri}/health")
+        async with Client() as client:
+            assert await client.healthcheck() == 200
+    run_with_server(scenario)
+
+
+def test_error_status_is_handled():
+    handled = []
+
+    class Client(AsyncBaseAPIClient):
+        max_timeout = 5.0
+        root_uri    = "http://127.0.0.1:1"
+
+        def handle_http_error(self, error):
+            handled.append(error.status)
+
+    async def scenario(uri):
+        async with Client() as client:
+            resp = await client.send("get", "fail", root_uri=uri)
+            assert resp.status == 503
+        async with client_class(uri)() as client:
+            with pytest.raises(aiohttp.ClientResponseError):
+                await client.send("get", "fail")
+    run_with_server(scenario)
+    assert handled == [503]
+
+
+def test_required_fields_are_validated():
+    class Client(AsyncBaseAPIClient):
+        max_timeout = 5.0
+
+    with pytest.raises(ClientValidationError):
+        Client()
@@ -0,0 +1,54 @@
+import pickle
+import time
+
+import requests
+
+from clientlib import CacheEntry, DiskCacheStorage, MemoryCacheStorage
+
+
+def entry(body: bytes, expires: float = None):
+    response = requests.Response()
+    response._content    = body
+    response.status_code = 200
+    response.headers.update({"ETag": '"v1"', "Content-Type": "application/octet-stream"})
+    response.url         = "http://example.invalid/items"
+    return CacheEntry(response, expires or time.time() + 60, {"accept": "*/*"})
+
+
+def test_disk_cache_round_trips_entries(tmp_path):
+    storage = DiskCacheStorage(tmp_path)
+    stored  = entry(bytes(range(256)))
+    storage.set("items", stored)
+
+    loaded = storage.get("items")
+    assert loaded.response.content == stored.response.content
+    assert loaded.response.status_code == 200
+    assert loaded.etag == '"v1"'
+    assert loaded.expires == stored.expires
+    assert loaded.vary == {"accept": "*/*"}
+
+
+def test_disk_cache_ignores_pickled_files(tmp_path):
+    class Exploit:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('unpickled')",))
+
+    storage = DiskCacheStorage(tmp_path)
+    storage._path("items").write_bytes(pickle.dumps(Exploit()))
+    assert storage.get("items") is None
+
+
+def test_memory_cache_limits_total_body_size():
+    storage = MemoryCacheStorage(max_entries=10, max_bytes=100)
+    storage.set("a", entry(b"a" * 40))
+    storage.set("b", entry(b"b" * 40))
+    storage.get("a")
+    storage.set("c", entry(b"c" * 40))
+    assert storage.get("b") is None
+    assert storage.get("a") is not None and storage.get("c") is not None
+
+    storage.set("big", entry(b"x" * 101))
+    assert storage.get("big") is None
+    storage.delete("a")
+    storage.set("c", entry(b"c" * 10))
+    assert storage._size == 10
@@ -0,0 +1,58 @@
+import http.server
+import json
+import threading
+import urllib.parse
+
+import pytest
+
+from clientlib import BaseAPIClient, LinkPagination, Paginator
+
+TOTAL = 25
+
+
+@pytest.fixture
+def link_server():
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url   = urllib.parse.urlsplit(self.path)
+            page  = int(dict(urllib.parse.parse_qsl(url.query)).get("page", 0))
+            body  = json.dumps(list(range(page * 10, min(page * 10 + 10, TOTAL)))).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            if page * 10 + 10 < TOTAL:
+                link = f"http://127.0.0.1:{self.server.server_port}{url.path}?page={page + 1}"
+                self.send_header("Link", f'<{link}>; rel="next"')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("root, endpoint", [("", "items"), ("/api/v1", "items"), ("/api", "v1/items")])
+def test_link_pagination_keeps_endpoint_stable(link_server, root, endpoint):
+    class Client(BaseAPIClient):
+        max_timeout   = 5
+        root_uri      = link_server + root
+        track_metrics = True
+
+    with Client() as client:
+        items = list(client.paginate(endpoint, paginator=LinkPagination(), prefetch=0))
+        assert items == list(range(TOTAL))
+        assert len(client.metrics_snapshot()) == 1
+
+
+def test_paginator_requires_next():
+    class Incomplete(Paginator):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,122 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from clientlib import BaseAPIClient
+
+
+class Response:
+    status_code = 200
+
+    def __init__(self, label):
+        self.label  = label
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        pass
+
+
+def hedging_client(outcomes):
+    """
+    Client whose attempts take and return the
+    next of `outcomes`, as (seconds, result).
+    """
+    outcomes = iter(outcomes)
+    lock     = threading.Lock()
+
+    class Client(BaseAPIClient):
+        max_timeout = 5
+        root_uri    = "http://primary.invalid"
+        hedging     = True
+        hedge_after = 0.05
+
+        def _send_once(self, method, endpoint, **kwargs):
+            with lock:
+                delay, result = next(outcomes)
+            time.sleep(delay)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+    return Client()
+
+
+def test_hedged_send_returns_hedge_when_first_attempt_fails():
+    client = hedging_client([
+        (0.10, requests.ConnectionError("first")),
+        (0.20, Response("hedge")),
+    ])
+    assert client.send("get", "items").label == "hedge"
+
+
+def test_hedged_send_closes_the_slower_success():
+    slow = Response("slow")
+    client = hedging_client([(0.20, slow), (0.0, Response("hedge"))])
+    assert client.send("get", "items").label == "hedge"
+    time.sleep(0.25)
+    assert slow.closed
+
+
+def test_hedged_send_raises_once_every_attempt_failed():
+    client = hedging_client([
+        (0.10, requests.ConnectionError("first")),
+        (0.10, requests.ConnectionError("hedge")),
+    ])
+    with pytest.raises(requests.ConnectionError):
+        client.send("get", "items")
+
+
+def test_circuit_breakers_are_keyed_by_base_uri():
+    class Client(BaseAPIClient):
+        max_timeout          = 5
+        root_uri             = "http://primary.invalid"
+        breaker_failure_rate = 0.5
+
+    client = Client()
+    assert client.circuit_breaker("items") is client.circuit_breaker("/items/")
+    assert client.circuit_breaker("items") is client.circuit_breaker("items", Client.root_uri)
+    assert client.circuit_breaker("items") is not client.circuit_breaker("items", "http://other.invalid")
+
+
+def test_token_bucket_rate_decays_after_reset_window():
+    from clientlib import TokenBucket
+
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.headers.update({"X-RateLimit-Remaining": "1", "X-RateLimit-Reset": "0.2"})
+
+    bucket = TokenBucket(rate=100, burst=1)
+    bucket.observe(resp)
+    assert bucket._state["rate"] == 1.0
+
+    time.sleep(0.25)
+    bucket.reserve(0)
+    assert bucket._state["rate"] == 100.0
+    assert bucket._state["until"] == 0.0
+
+
+def test_failed_probe_releases_its_half_open_trial():
+    class Client(BaseAPIClient):
+        max_timeout          = 5
+        root_uri             = "http://probe.invalid"
+        breaker_failure_rate = 0.5
+        breaker_min_calls    = 1
+        breaker_cooldown     = 0.05
+
+        def _send_once(self, method, endpoint, **kwargs):
+            raise RuntimeError("not a requests error")
+
+    client  = Client()
+    breaker = client.circuit_breaker("items")
+    breaker.record(False)
+    time.sleep(0.1)
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            client.send("get", "items")
+    assert breaker._trials == 0
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+from clientlib import ClientResponseError, _iter_json_array
+
+
+def chunked(text: str, size: int):
+    data = text.encode()
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("text", [
+    "[1.5]",
+    "[10.25, 3]",
+    "[1e5]",
+    "[-0.5e-3, true, false, null]",
+    '["a,]b", {"x": [1, 2]}, []]',
+    "[ ]",
+])
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 64])
+def test_iter_json_array_chunk_boundaries(text, size):
+    assert list(_iter_json_array(chunked(text, size), 1024)) == json.loads(text)
+
+
+@pytest.mark.parametrize("text", [
+    "[1,,2 3]",
+    "[1 2]",
+    "[1,]",
+    "[,1]",
+    "[1",
+    "[1.]",
+    '{"a": 1}',
+])
+@pytest.mark.parametrize("size", [1, 3, 64])
+def test_iter_json_array_rejects_malformed(text, size):
+    with pytest.raises(ClientResponseError):
+        list(_iter_json_array(chunked(text, size), 1024))
+
+
+def test_iter_json_array_max_size_counts_bytes():
+    text = json.dumps(["é" * 600], ensure_ascii=False)
+    with pytest.raises(ClientResponseError):
+        list(_iter_json_array(chunked(text, 64), 1024))
+    assert list(_iter_json_array(chunked(text, 64), 2048)) == ["é" * 600]
+
+
+
+def test_iter_json_array_decodes_a_chunked_item_once(monkeypatch):
+    calls, raw_decode = [], json.JSONDecoder.raw_decode
+
+    def counting(self, *args):
+        calls.append(args)
+        return raw_decode(self, *args)
+
+    monkeypatch.setattr(json.JSONDecoder, "raw_decode", counting)
+    item = {"text": 'a "quoted" \\ value ' * 2000, "values": list(range(2000))}
+    text = json.dumps([item, "é" * 100])
+    assert list(_iter_json_array(chunked(text, 7), 1024 ** 2)) == [item, "é" * 100]
+    assert len(calls) == 2
+
+@pytest.fixture
+def truncating_server():
+    import http.server
+    import threading
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "100000")
+            self.end_headers()
+            self.wfile.write(b"x" * 10)
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_download_to_removes_partial_file(tmp_path, truncating_server):
+    from clientlib import BaseAPIClient
+
+    class Client(BaseAPIClient):
+        max_timeout = 5
+        root_uri    = truncating_server
+
+    with Client() as client:
+        with pytest.raises(Exception):
+            client.download_to(tmp_path / "blob", "get", "blob")
+    assert list(tmp_path.iterdir()) == []
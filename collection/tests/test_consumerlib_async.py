@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import logging
+import sqlite3
+
+import pytest
+
+from consumerlib import AsyncDatabaseClient, FetchMap, ParamMap, Parameter
+from consumerlib.helpers.aio import threaded
+from consumerlib.helpers.pools import AsyncConnectionPool
+
+
+class Params(ParamMap):
+    database = Parameter("DATABASE")
+
+
+class Client(AsyncDatabaseClient):
+    connectable    = threaded(sqlite3.connect)
+    connect_params = Params
+    pool_min_size  = 1
+    pool_max_size  = 2
+
+
+def run_with_client(tmp_path, scenario):
+    async def main():
+        client = Client({"DATABASE": str(tmp_path / "async.db")}, logging.getLogger(__name__))
+        async with client:
+            await client.execute("CREATE TABLE items (value INTEGER)", ())
+            await client.execute("INSERT INTO items VALUES (1), (2), (3)", ())
+            return await scenario(client)
+    return asyncio.run(main())
+
+
+def run_with_pool(scenario, **kwargs):
+    async def main():
+        pool = AsyncConnectionPool(functools.partial(threaded(sqlite3.connect), ":memory:"), **kwargs)
+        await pool.open()
+        try:
+            return await scenario(pool)
+        finally:
+            await pool.close()
+    return asyncio.run(main())
+
+
+def test_execute_fetches_one_and_all(tmp_path):
+    async def scenario(client):
+        one = await client.execute("SELECT value FROM items ORDER BY value", (), "ONE")
+        all = await client.execute("SELECT value FROM items ORDER BY value", (), FetchMap.ALL)
+        return one, all
+
+    assert run_with_client(tmp_path, scenario) == ((1,), [(1,), (2,), (3,)])
+
+
+def test_execute_streams_batches_and_rows(tmp_path):
+    async def scenario(client):
+        query   = "SELECT value FROM items ORDER BY value"
+        batches = [b async for b in await client.execute(query, (), FetchMap.MANY(2))]
+        rows    = [r async for r in client.stream(query, ())]
+        return batches, rows
+
+    batches, rows = run_with_client(tmp_path, scenario)
+    assert batches == [[(1,), (2,)], [(3,)]]
+    assert rows == [(1,), (2,), (3,)]
+
+
+def test_healthcheck(tmp_path):
+    async def scenario(client):
+        healthy = await client.healthcheck()
+        await client.close()
+        return healthy, await client.healthcheck()
+
+    assert run_with_client(tmp_path, scenario) == (True, False)
+
+
+def test_pool_times_out_when_exhausted():
+    async def scenario(pool):
+        held = [await pool.get(), await pool.get()]
+        with pytest.raises(TimeoutError):
+            await pool.get(timeout=0.05)
+        await pool.put(held.pop())
+        connection = await pool.get(timeout=0.05)
+        stats = pool.stats()
+        await pool.put(connection)
+        await pool.put(held.pop())
+        return stats
+
+    stats = run_with_pool(scenario, min_size=1, max_size=2)
+    assert stats.timeouts == 1
+    assert stats.in_use == 2
+
+
+def test_pool_acquire_rolls_back_and_returns_on_error():
+    async def scenario(pool):
+        async with pool.acquire() as connection:
+            cursor = await connection.cursor()
+            await cursor.execute("CREATE TABLE items (value INTEGER)")
+            await cursor.close()
+
+        with pytest.raises(RuntimeError):
+            async with pool.acquire() as connection:
+                cursor = await connection.cursor()
+                await cursor.execute("INSERT INTO items VALUES (1)")
+                raise RuntimeError
+
+        async with pool.acquire() as connection:
+            cursor = await connection.cursor()
+            await cursor.execute("SELECT value FROM items")
+            rows = await cursor.fetchall()
+            await cursor.close()
+        return rows, pool.stats()
+
+    rows, stats = run_with_pool(scenario, min_size=1, max_size=1)
+    assert rows == []
+    assert (stats.size, stats.in_use) == (1, 0)
+
+
+def test_pool_close_with_connections_checked_out():
+    closed = []
+
+    async def scenario(pool):
+        connection = await pool.get()
+        close      = connection.close
+
+        async def tracked_close():
+            closed.append(connection)
+            await close()
+
+        connection.close = tracked_close
+        await pool.close()
+        assert closed == []
+        with pytest.raises(ConnectionError):
+            await pool.get()
+
+        await pool.put(connection)
+        return pool.stats()
+
+    stats = run_with_pool(scenario, min_size=1, max_size=2)
+    assert len(closed) == 1
+    assert (stats.size, stats.idle, stats.in_use) == (0, 0, 0)
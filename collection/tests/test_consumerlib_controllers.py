@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+
+from consumerlib import (
+    AdaptiveLimit, BaseClient, ClientMap, Controller, EventMap, ParamMap, Parameter)
+
+
+class Params(ParamMap):
+    database = Parameter("DATABASE")
+
+
+class SQLiteClient(BaseClient):
+    connect_params = Params
+
+
+class Clients(ClientMap):
+    db = SQLiteClient
+
+
+class Events(EventMap):
+    work = "work"
+
+
+class ConcurrentController(Controller):
+    clients_class     = Clients
+    event_channels    = Events
+    concurrency_class = AdaptiveLimit
+
+    def prerun(self):
+        self.handled = []
+        self.threads = set()
+        super().prerun()
+
+    def connect(self):
+        self.clients.connect()
+
+    def close(self):
+        self.clients.close()
+
+    def handle_event(self, event, message):
+        time.sleep(0.01)
+        if message["n"] == 3:
+            raise ValueError("handler failure")
+        self.clients.db.connection.execute("SELECT 1")
+        self.threads.add(threading.get_ident())
+        self.handled.append(message["n"])
+
+
+def run_events(controller, count):
+    controller.prerun()
+    for n in range(count):
+        controller.queue.put_nowait({"channel": "/events/work", "n": n})
+    controller.set_listen_state("LISTENING")
+    controller._active_watch_queue()
+    controller.stop()
+
+
+def test_concurrent_handlers_share_sqlite_clients():
+    controller = ConcurrentController({"DATABASE": ":memory:"}, logging.getLogger(__name__))
+    run_events(controller, 20)
+
+    assert sorted(controller.handled) == [n for n in range(20) if n != 3]
+    assert threading.get_ident() not in controller.threads
+    assert controller._concurrency.limit > 1
+
+
+def test_stop_waits_for_in_flight_handlers():
+    controller = ConcurrentController({"DATABASE": ":memory:"}, logging.getLogger(__name__))
+    run_events(controller, 8)
+
+    assert len(controller.handled) == 7
+    assert controller._executor is None
+    assert controller.clients.db.connect_state.name == "CLOSED"
+
+
+def test_inline_handler_failures_are_logged(caplog):
+    class InlineController(ConcurrentController):
+        concurrency_class = None
+
+    controller = InlineController({"DATABASE": ":memory:"}, logging.getLogger(__name__))
+    run_events(controller, 5)
+
+    assert sorted(controller.handled) == [0, 1, 2, 4]
+    assert "failed handling event" in caplog.text
+
+
+def test_refresh_keeps_checked_out_clients_open():
+    class RefreshingController(ConcurrentController):
+        concurrency_class = None
+
+        def handle_event(self, event, message):
+            before  = self.clients
+            refresh = self.refresh()
+            while self._clients is before:
+                time.sleep(0.01)
+            self.pinned = (self.clients is before, before.db.connect_state.name)
+            self.refresh_thread = refresh
+
+    controller = RefreshingController({"DATABASE": ":memory:"}, logging.getLogger(__name__))
+    controller.prerun()
+    retired = controller.clients
+    controller.queue.put_nowait({"channel": "/events/work", "n": 0})
+    controller.set_listen_state("LISTENING")
+    controller._active_watch_queue()
+    controller.refresh_thread.join()
+
+    assert controller.pinned == (True, "OPEN")
+    assert retired.db.connect_state.name == "CLOSED"
+    assert controller.clients is not retired
+    controller.stop()
@@ -0,0 +1,28 @@
+from psycopg2 import sql
+
+from consumerlib.clients.mixins import _copy_literal, _copy_query
+
+
+def test_copy_literal_escapes_text():
+    assert _copy_literal(None) == "\\N"
+    assert _copy_literal("a\tb\nc\\") == "a\\tb\\nc\\\\"
+    assert _copy_literal(12) == "12"
+
+
+def test_copy_literal_encodes_bytes_as_bytea_hex():
+    assert _copy_literal(b"\x00\xff") == "\\\\x00ff"
+    assert _copy_literal(bytearray(b"ab")) == "\\\\x6162"
+    assert _copy_literal(memoryview(b"")) == "\\\\x"
+
+
+def test_copy_query_quotes_identifiers():
+    def identifiers(composed):
+        for part in composed.seq:
+            if isinstance(part, sql.Composed):
+                yield from identifiers(part)
+            elif isinstance(part, sql.Identifier):
+                yield part.strings
+
+    query = _copy_query("public.Items", ["id", "Select"])
+    assert list(identifiers(query)) == [("public", "Items"), ("id",), ("Select",)]
+    assert query.seq[-1] == sql.SQL(" FROM STDIN")
@@ -0,0 +1,102 @@
+import logging
+import sqlite3
+import time
+
+from consumerlib import ClientMap, DatabaseClient, ParamMap, Parameter
+from consumerlib.helpers.retry import ReconnectPolicy
+
+
+class Params(ParamMap):
+    database = Parameter("DATABASE")
+
+
+class SQLiteClient(DatabaseClient):
+    connectable    = sqlite3.connect
+    connect_params = Params
+
+
+class Clients(ClientMap):
+    db = SQLiteClient
+    reconnect_policy = ReconnectPolicy(0.01, 0.05)
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def new_clients():
+    return Clients({"DATABASE": ":memory:"}, logging.getLogger(__name__))
+
+
+def test_reconnects_after_close_and_connect():
+    clients = new_clients()
+    clients.connect()
+    clients.close()
+    clients.connect()
+
+    clients.db.connection.close()
+    assert clients.check_health() == ["db"]
+    assert wait_for(lambda: clients.healthy)
+    clients.close()
+
+
+def test_reconnect_swaps_in_a_fresh_client():
+    clients = new_clients()
+    clients.connect()
+    failed = clients.db
+
+    with clients.checkout():
+        failed.connection.close()
+        clients.check_health()
+        assert wait_for(lambda: clients.db is not failed)
+        assert failed.connect_state.name == "OPEN"
+
+    assert wait_for(lambda: failed.connect_state.name == "CLOSED")
+    assert clients.healthy
+    clients.close()
+
+
+def test_reconnect_drains_only_the_retired_client():
+    class Pair(ClientMap):
+        db    = SQLiteClient
+        other = SQLiteClient
+        reconnect_policy = ReconnectPolicy(0.01, 0.05)
+
+    clients = Pair({"DATABASE": ":memory:"}, logging.getLogger(__name__))
+    clients.connect()
+    failed = clients.db
+
+    handler = clients.checkout()
+    handler.__enter__()
+    failed.connection.close()
+    clients.check_health()
+    assert wait_for(lambda: clients.db is not failed)
+
+    # a handler checked out after the swap does
+    # not hold back closing the retired client.
+    with clients.checkout():
+        handler.__exit__(None, None, None)
+        assert wait_for(lambda: failed.connect_state.name == "CLOSED")
+
+    clients.close()
+
+
+def test_client_without_healthcheck_override_can_be_created():
+    from consumerlib.clients.mixins import ClientABCMixIn
+
+    class Client(ClientABCMixIn):
+        def connect(self):
+            pass
+
+        def close(self):
+            pass
+
+        def _healthcheck(self):
+            return True
+
+    assert Client().healthcheck() is True
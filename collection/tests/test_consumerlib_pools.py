@@ -0,0 +1,97 @@
+import logging
+import sqlite3
+import time
+
+import pytest
+
+from consumerlib import ParamMap, Parameter, PooledDatabaseClient
+from consumerlib.helpers.pools import ConnectionPool
+
+
+class Params(ParamMap):
+    database = Parameter("DATABASE")
+
+
+class Client(PooledDatabaseClient):
+    connectable    = sqlite3.connect
+    connect_params = Params
+    pool_min_size  = 1
+    pool_max_size  = 2
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = Client({"DATABASE": str(tmp_path / "pool.db")}, logging.getLogger(__name__))
+    with client:
+        client.execute("CREATE TABLE items (value INTEGER)", ())
+        yield client
+
+
+def test_cursor_releases_connection_on_close(client):
+    cursor = client.cursor()
+    assert client.pool_stats.in_use == 1
+
+    cursor.execute("INSERT INTO items VALUES (1)")
+    cursor.close()
+    cursor.close()
+    assert client.pool_stats.in_use == 0
+    assert client.execute("SELECT value FROM items", (), "ALL") == [(1,)]
+
+
+def test_cursor_context_rolls_back_on_error(client):
+    with pytest.raises(RuntimeError):
+        with client.cursor() as cursor:
+            cursor.execute("INSERT INTO items VALUES (2)")
+            raise RuntimeError
+    assert client.pool_stats.in_use == 0
+    assert client.execute("SELECT value FROM items", (), "ALL") == []
+
+
+def test_cursor_iterates_rows(client):
+    client.executemany("INSERT INTO items VALUES (?)", [(1,), (2,)])
+    with client.cursor() as cursor:
+        cursor.execute("SELECT value FROM items ORDER BY value")
+        assert list(cursor) == [(1,), (2,)]
+
+
+def test_open_closes_connections_when_one_fails():
+    opened, closed = [], []
+
+    class Connection:
+        def close(self):
+            closed.append(self)
+
+    def factory():
+        if len(opened) == 2:
+            raise ConnectionError("refused")
+        opened.append(Connection())
+        return opened[-1]
+
+    pool = ConnectionPool(factory, min_size=3)
+    with pytest.raises(ConnectionError):
+        pool.open()
+    assert closed == opened
+    assert pool.stats().size == 0
+
+
+def test_expired_idle_connections_are_reaped_from_the_oldest_end():
+    closed = []
+
+    class Connection:
+        def close(self):
+            closed.append(self)
+
+        def commit(self):
+            pass
+
+    pool = ConnectionPool(Connection, min_size=0, idle_timeout=0.05, healthcheck=None)
+    oldest, newest = pool.get(), pool.get()
+    pool.put(oldest)
+    time.sleep(0.1)
+
+    pool.put(newest)
+    assert closed == [oldest]
+    for _ in range(3):
+        pool.put(pool.get())
+    assert pool.stats().size == 1
+    assert closed == [oldest]
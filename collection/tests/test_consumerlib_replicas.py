@@ -0,0 +1,72 @@
+import logging
+import sqlite3
+
+import psycopg2
+import pytest
+
+from consumerlib import ParamMap, Parameter, ReplicatedDatabaseClient
+
+
+class Params(ParamMap):
+    database = Parameter("DATABASE")
+
+
+class FailingConnection:
+    # a replica that accepts connections but
+    # fails every query.
+
+    def cursor(self, *args, **kwargs):
+        return self
+
+    def execute(self, *args):
+        raise psycopg2.OperationalError("replica is down")
+
+    def close(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+def connect(database):
+    if database.endswith("down.db"):
+        return FailingConnection()
+    return sqlite3.connect(database, check_same_thread=False)
+
+
+class Client(ReplicatedDatabaseClient):
+    connectable        = staticmethod(connect)
+    connect_params     = Params
+    replica_host_param = "database"
+
+
+@pytest.fixture
+def paths(tmp_path):
+    paths = {name: str(tmp_path / f"{name}.db") for name in ("primary", "down", "replica")}
+    for path in paths.values():
+        if not path.endswith("down.db"):
+            with sqlite3.connect(path) as connection:
+                connection.execute("CREATE TABLE items (source TEXT)")
+                connection.execute("INSERT INTO items VALUES (?)", (path,))
+    return paths
+
+
+def client_for(paths, *replicas):
+    settings = {"DATABASE": paths["primary"], "DATABASE_REPLICAS": ", ".join(replicas)}
+    return Client(settings, logging.getLogger(__name__))
+
+
+def test_stream_fails_over_to_the_next_replica(paths):
+    with client_for(paths, paths["down"], paths["replica"]) as client:
+        rows = list(client.execute("SELECT source FROM items", (), "ITER"))
+        assert rows == [(paths["replica"],)]
+        assert [r.host for r in client._replicas.candidates()] == [paths["replica"]]
+
+
+def test_stream_falls_back_to_the_primary(paths):
+    with client_for(paths, paths["down"]) as client:
+        rows = list(client.execute("SELECT source FROM items", (), "ITER"))
+        assert rows == [(paths["primary"],)]
@@ -0,0 +1,56 @@
+import socket
+import threading
+
+import pytest
+
+from socketlab import FILE_HEADER, Framer, SocketTransferError
+
+
+@pytest.fixture
+def framers():
+    left, right = socket.socketpair()
+    yield Framer(left), Framer(right)
+    left.close()
+    right.close()
+
+
+def test_send_file_rejects_offset_past_end(framers, tmp_path):
+    sender, _ = framers
+    path = tmp_path / "data"
+    path.write_bytes(b"abc")
+
+    with pytest.raises(ValueError):
+        sender.send_file(path, offset=4)
+    with pytest.raises(ValueError):
+        sender.send_file(path, count=-1)
+
+
+def test_send_file_at_end_sends_nothing(framers, tmp_path):
+    sender, receiver = framers
+    path = tmp_path / "data"
+    path.write_bytes(b"abc")
+
+    sender.send_file(path, offset=3)
+    assert receiver.recv_file(tmp_path / "copy") == 0
+    assert (tmp_path / "copy").read_bytes() == b""
+
+
+def test_recv_file_round_trip(framers, tmp_path):
+    sender, receiver = framers
+    path = tmp_path / "data"
+    path.write_bytes(bytes(range(256)) * 64)
+
+    thread = threading.Thread(target=sender.send_file, args=(path, 10, 1000, "sha256"))
+    thread.start()
+    assert receiver.recv_file(tmp_path / "copy") == 1000
+    thread.join()
+    assert (tmp_path / "copy").read_bytes() == path.read_bytes()[10:1010]
+
+
+def test_recv_file_refuses_oversized_header(framers, tmp_path):
+    sender, receiver = framers
+    sender.send(FILE_HEADER.pack(2 ** 62))
+
+    with pytest.raises(SocketTransferError):
+        receiver.recv_file(tmp_path / "copy", max_size=1024)
+    assert not (tmp_path / "copy").exists()
@@ -0,0 +1,60 @@
+import socket
+import threading
+
+from socketlab import ConnectionHandler, Reactor, ServerSocket
+
+
+class Collector(ConnectionHandler):
+    received = b""
+    closed_  = False
+
+    def readable(self, connection):
+        self.received += bytes(connection.read_buffer)
+        connection.read_buffer.clear()
+
+    def closed(self, connection):
+        self.closed_ = True
+
+
+def test_data_filling_the_buffer_before_eof_is_delivered():
+    reactor, handler = Reactor(read_size=4), Collector()
+    with ServerSocket("127.0.0.1", 0) as server:
+        reactor.add_server(server, lambda: handler)
+        with socket.create_connection(server.socket.getsockname()) as peer:
+            peer.sendall(b"abcdefgh")
+
+        for _ in range(50):
+            reactor.run(timeout=0.02)
+            if handler.closed_:
+                break
+
+    assert handler.received == b"abcdefgh"
+    assert handler.closed_
+
+
+def test_timers_rescheduled_on_the_reactor_thread_do_not_wake_it():
+    class Waker:
+        def __init__(self, sock):
+            self.sock = sock
+
+        def send(self, data):
+            wakes.append(data)
+            return self.sock.send(data)
+
+        def close(self):
+            self.sock.close()
+
+    reactor, ticks, wakes = Reactor(), [], []
+    reactor._waker = Waker(reactor._waker)
+
+    reactor.call_every(0.01, lambda: ticks.append(1))
+    wakes.clear()
+    reactor.run(timeout=0.1)
+    assert len(ticks) >= 3
+    assert wakes == []
+
+    thread = threading.Thread(target=reactor.call_soon, args=(ticks.clear,))
+    thread.start()
+    thread.join()
+    assert len(wakes) == 1
+    reactor.close()
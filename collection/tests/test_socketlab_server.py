@@ -0,0 +1,30 @@
+import asyncio
+
+from socketlab import AsyncServerSocket
+
+
+def test_run_leaves_no_pending_tasks_when_serving_ends():
+    pending = []
+
+    async def echo(reader, writer):
+        writer.write(await reader.read(5))
+        await writer.drain()
+
+    async def main():
+        server = AsyncServerSocket("127.0.0.1", 0)
+        run    = asyncio.ensure_future(server._run(echo, 1.0))
+        while server._server is None:
+            await asyncio.sleep(0.01)
+
+        reader, writer = await asyncio.open_connection(*server._socket.getsockname())
+        writer.write(b"hello")
+        assert await reader.read(5) == b"hello"
+        writer.close()
+        await writer.wait_closed()
+
+        server._server.close()
+        await run
+        pending.extend(t for t in asyncio.all_tasks() if t is not asyncio.current_task())
+
+    asyncio.run(main())
+    assert pending == []